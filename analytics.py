@@ -0,0 +1,198 @@
+"""
+Usage analytics
+
+- record() appends one tuple to an in-memory ring buffer (a bounded deque,
+  oldest events dropped when full) and returns; nothing touches disk on the
+  rerun path
+- a daemon thread drains the buffer every FLUSH_SECONDS (or as soon as
+  BATCH events are waiting) into a local SQLite file with one executemany
+  per batch; close() / interpreter exit flushes what is left
+- sqlite3 is only imported by the first flush (which also creates the
+  table) and by report(), so importing this module stays cheap
+- report() aggregates the file: top MBTI types, queries, jobs, colors and
+  rerun latency percentiles
+
+Events: (ts, app, session, kind, mbti, item, value)
+  kind   select | search | favorite | download | share_open | quiz | color | rerun
+  item   query / job title / color / export name, when there is one
+  value  rerun time in ms for "rerun"
+
+Usage:
+  python analytics.py [analytics.db] [--days 7]
+"""
+
+import argparse
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+CAPACITY = 50000
+BATCH = 500
+FLUSH_SECONDS = 2.0
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL, app TEXT, session TEXT, kind TEXT NOT NULL,
+    mbti TEXT, item TEXT, value REAL)"""
+INDEX = "CREATE INDEX IF NOT EXISTS events_kind_ts ON events (kind, ts)"
+
+
+class Analytics:
+    def __init__(self, path, capacity=CAPACITY, batch=BATCH, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.batch = batch
+        self.flush_seconds = flush_seconds
+        self.buffer = deque(maxlen=capacity)
+        self.recorded = 0
+        self.dropped = 0   # overwritten in the ring before they were flushed
+        self.written = 0
+        self._wake = threading.Event()
+        self._stop = False
+        self._flush_lock = threading.Lock()
+        self._created = False
+        self._thread = threading.Thread(target=self._run, name="analytics-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, kind, app="main", session=None, mbti=None, item=None, value=None):
+        # deque.append is atomic; the counters are advisory only
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append((time.time(), app, session, kind, mbti, item, value))
+        self.recorded += 1
+        if len(self.buffer) >= self.batch:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        import sqlite3
+
+        with self._flush_lock:
+            rows = []
+            while True:
+                try:
+                    rows.append(self.buffer.popleft())
+                except IndexError:
+                    break
+            if not rows:
+                return 0
+            try:
+                with closing(sqlite3.connect(self.path, timeout=5)) as con, con:
+                    if not self._created:
+                        con.execute(SCHEMA)
+                        con.execute(INDEX)
+                    con.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error:
+                # keep the app alive if the file cannot be opened or written; these events are lost
+                self.dropped += len(rows)
+                return 0
+            self._created = True
+            self.written += len(rows)
+            return len(rows)
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        self.flush()
+
+    def stats(self):
+        return {"buffered": len(self.buffer), "recorded": self.recorded,
+                "written": self.written, "dropped": self.dropped}
+
+
+class NullAnalytics:
+    """Stand-in when analytics is switched off (MBTI_ANALYTICS=0)."""
+
+    def record(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        return 0
+
+    def stats(self):
+        return {}
+
+
+def default_db_path():
+    return os.environ.get("MBTI_ANALYTICS_DB",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "analytics.db"))
+
+
+def open_analytics(path=None):
+    if os.environ.get("MBTI_ANALYTICS", "1") == "0":
+        return NullAnalytics()
+    return Analytics(path or default_db_path())
+
+
+# -----------------------
+# Report
+# -----------------------
+def percentile(values, p):
+    if not values:
+        return None
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def report(path, since=None, top=10):
+    import sqlite3
+
+    since = since or 0.0
+    with closing(sqlite3.connect(path)) as con:
+        def top_items(kind, column="item"):
+            return con.execute(f"SELECT {column}, COUNT(*) AS n FROM events WHERE kind = ? AND ts >= ? "
+                               f"AND {column} IS NOT NULL GROUP BY {column} ORDER BY n DESC LIMIT ?",
+                               (kind, since, top)).fetchall()
+
+        reruns = {}
+        for app, value in con.execute("SELECT app, value FROM events WHERE kind = 'rerun' AND ts >= ? "
+                                      "ORDER BY app, value", (since,)):
+            reruns.setdefault(app, []).append(value)
+        return {
+            "events": con.execute("SELECT COUNT(*) FROM events WHERE ts >= ?", (since,)).fetchone()[0],
+            "sessions": con.execute("SELECT COUNT(DISTINCT session) FROM events WHERE ts >= ?",
+                                    (since,)).fetchone()[0],
+            "top_types": top_items("select", "mbti"),
+            "top_queries": top_items("search"),
+            "top_favorites": top_items("favorite"),
+            "top_shared": top_items("share_open"),
+            "top_downloads": top_items("download"),
+            "top_colors": top_items("color"),
+            "quiz_results": top_items("quiz", "mbti"),
+            "rerun_ms": {app: {"n": len(v), "p50": round(percentile(v, 50), 1), "p95": round(percentile(v, 95), 1)}
+                         for app, v in reruns.items()},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Usage analytics report")
+    parser.add_argument("db", nargs="?", default=default_db_path())
+    parser.add_argument("--days", type=float, help="only events from the last N days")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        parser.exit(1, f"no analytics file at {args.db}\n")
+    since = time.time() - args.days * 86400 if args.days else None
+    r = report(args.db, since, args.top)
+    print(f"{r['events']} events · {r['sessions']} sessions")
+    for title, key in (("MBTI types", "top_types"), ("queries", "top_queries"),
+                       ("favorited jobs", "top_favorites"), ("shared jobs", "top_shared"),
+                       ("downloads", "top_downloads"), ("colors", "top_colors"), ("quiz results", "quiz_results")):
+        if r[key]:
+            print(f"\ntop {title}:")
+            for name, n in r[key]:
+                print(f"  {n:>6}  {name}")
+    for app, s in r["rerun_ms"].items():
+        print(f"\nrerun {app}: n={s['n']} p50={s['p50']}ms p95={s['p95']}ms")
+
+
+if __name__ == "__main__":
+    main()
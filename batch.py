@@ -0,0 +1,158 @@
+"""
+Batch recommendations (no Streamlit)
+
+Reads users (MBTI + optional keywords) from a CSV file, ranks jobs for each
+with the same catalog / search index / affinity matrix as main.py, and
+streams the results into one CSV (UTF-8 with BOM, same job columns as the
+app's export).
+
+Input columns: mbti (required), keywords (optional), id (optional; the row
+number is used when missing).
+
+Usage:
+  python batch.py users.csv recommendations.csv --top 5 --workers 4
+  python batch.py users.csv out.csv --catalog jobs_100k.mcat --same-type
+
+Python API:
+  for user, rows in recommend_users(users, top=5): ...
+  (rows are dicts keyed by the export columns, not catalog jobs)
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+from itertools import islice
+
+from cache import LRUCache
+from catalog import load_catalog
+from export import COLUMNS, iter_csv_rows, job_row
+from recommend import TYPE_INDEX, Recommender
+from search import SearchIndex, normalize, select_cards
+
+OUTPUT_COLUMNS = ["User ID", "User MBTI", "Keywords", "Rank"] + COLUMNS
+CHUNK_USERS = 200
+
+# per-process state; built once in the parent and inherited by forked workers
+_engine = None
+
+
+class Engine:
+    def __init__(self, catalog_path=None):
+        self.catalog = load_catalog(catalog_path)
+        self.index = SearchIndex(self.catalog)
+        self.recommender = Recommender(self.catalog)
+        self.results = LRUCache(4096)  # many users share a type + keywords
+
+    def recommend(self, mbti, keywords="", top=5, same_type=False):
+        query = normalize(keywords)
+        ids = self.results.get_or_compute(
+            (mbti, query, top, same_type),
+            lambda: select_cards(self.catalog, self.index, mbti, same_type, query, self.recommender, k=top))
+        return [self.catalog[i] for i in ids]
+
+
+def _init_worker(catalog_path):
+    global _engine
+    if _engine is None or getattr(_engine, "path", None) != catalog_path:
+        _engine = Engine(catalog_path)
+        _engine.path = catalog_path
+
+
+def _user_rows(args):
+    user, top, same_type = args
+    mbti = (user.get("mbti") or "").strip().upper()
+    keywords = (user.get("keywords") or "").strip()
+    if mbti not in TYPE_INDEX:
+        return None  # unknown type: counted as skipped
+    jobs = _engine.recommend(mbti, keywords, top, same_type)
+    return [[user.get("id", ""), mbti, keywords, rank] + job_row(job)
+            for rank, job in enumerate(jobs, 1)]
+
+
+def read_users(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for n, row in enumerate(csv.DictReader(f), 1):
+            row = {k.strip().lower(): v for k, v in row.items() if k}
+            row.setdefault("id", str(n))
+            yield row
+
+
+def recommend_users(users, catalog_path=None, top=5, same_type=False, workers=1):
+    """Yield (user, [row, ...]) in input order; workers > 1 uses a process pool.
+
+    Each row is a dict keyed by export.COLUMNS ("MBTI", "Job Title",
+    "Short Description", "Icon", "Recommended Majors", "Key Skills"), best
+    fit first, with majors and skills joined by "; " as in the CSV. A user
+    with an unknown MBTI type gets an empty list.
+    """
+    for user, rows in _map_users(users, catalog_path, top, same_type, workers):
+        yield user, [dict(zip(COLUMNS, row[4:])) for row in rows or ()]
+
+
+def _map_users(users, catalog_path, top, same_type, workers):
+    _init_worker(catalog_path)  # in the parent, so forked workers start warm
+    tasks = ((user, top, same_type) for user in users)
+    if workers <= 1:
+        for task in tasks:
+            yield task[0], _user_rows(task)
+        return
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+        pending = iter(tasks)
+        while True:
+            chunk = list(islice(pending, CHUNK_USERS * workers))
+            if not chunk:
+                return
+            for task, rows in zip(chunk, pool.imap(_user_rows, chunk, chunksize=CHUNK_USERS)):
+                yield task[0], rows
+
+
+def write_recommendations(users, out_path, catalog_path=None, top=5, same_type=False, workers=1):
+    counts = {"users": 0, "skipped": 0, "empty": 0, "rows": 0}
+
+    def row_chunks():
+        chunk = []
+        for user, rows in _map_users(users, catalog_path, top, same_type, workers):
+            counts["users"] += 1
+            if rows is None:
+                counts["skipped"] += 1
+                continue
+            counts["empty"] += not rows
+            counts["rows"] += len(rows)
+            chunk.extend(rows)
+            if len(chunk) >= 1000:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        for part in iter_csv_rows(OUTPUT_COLUMNS, row_chunks()):
+            f.write(part)
+    os.replace(tmp, out_path)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch MBTI job recommendations")
+    parser.add_argument("users", help="CSV with mbti[, keywords][, id] columns")
+    parser.add_argument("output", help="output CSV path")
+    parser.add_argument("--top", type=int, default=5, help="jobs per user (default 5)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--catalog", default=os.environ.get("MBTI_CATALOG"),
+                        help="packed or JSON catalog (default: built-in / $MBTI_CATALOG)")
+    parser.add_argument("--same-type", action="store_true", help="only recommend jobs listed under the user's type")
+    args = parser.parse_args(argv)
+
+    counts = write_recommendations(read_users(args.users), args.output, args.catalog,
+                                   args.top, args.same_type, args.workers)
+    print(f"{counts['users']} users -> {counts['rows']} rows in {args.output} "
+          f"({counts['skipped']} skipped: unknown MBTI, {counts['empty']} without matches)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Headless load test / benchmark for main.py and test.py
+
+Runs scripted user sessions through Streamlit's AppTest (no browser, no
+network) against catalogs of several sizes and reports, per app and size:
+- rerun latency percentiles (p50 / p95 / p99) and the slowest step
+- memory retained per session (tracemalloc, separate pass)
+- elements per rerun (size of the rendered element tree)
+
+The "logic" app times the data modules directly, without a Streamlit
+runtime: cold import of the modules main.py uses, catalog load, index and
+affinity build, and query latency percentiles.
+
+Usage:
+  python bench.py                               # sizes 64, 10000, 100000; 12 and 300 colors
+  python bench.py --sizes 64 10000 --sessions 5 --concurrency 4
+  python bench.py --apps logic --sizes 100000    # data modules only, no Streamlit
+  python bench.py --save-baseline               # record bench_baseline.json
+  python bench.py --baseline bench_baseline.json --tolerance 0.25
+      -> exit code 1 if any p95, session memory or element count is more
+         than 25% above the baseline
+
+Other sizes are generated with gen_catalog.generate_jobs (seeded by the
+size, so runs are comparable), packed into a temp dir and passed to main.py
+through MBTI_CATALOG; color sets for test.py likewise with generate_colors
+through MBTI_COLOR_DATA.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import MBTI_JOBS, write_packed
+from colors import COLOR_DATA
+from gen_catalog import generate_colors, generate_jobs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RUN_TIMEOUT = 600  # first run on a 100k catalog builds the search index
+
+
+# -----------------------
+# Catalogs
+# -----------------------
+def catalog_path(n, workdir):
+    if n == sum(len(jobs) for jobs in MBTI_JOBS.values()):
+        return None  # the built-in catalog
+    path = os.path.join(workdir, f"bench_{n}.mcat")
+    if not os.path.exists(path):
+        write_packed(generate_jobs(n, seed=n), path)
+    return path
+
+
+def colors_path(n, workdir):
+    if n == len(COLOR_DATA):
+        return None
+    path = os.path.join(workdir, f"bench_colors_{n}.json")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(generate_colors(n, seed=n), f, ensure_ascii=False)
+    return path
+
+
+# -----------------------
+# Sessions
+# -----------------------
+def widget(widgets, label_part):
+    for w in widgets:
+        if label_part in (w.label or ""):
+            return w
+    return None
+
+
+def main_session(at, rng):
+    """Yields after each scripted interaction; the caller times at.run()."""
+    yield "open"
+    w = widget(at.selectbox, "MBTI 선택")
+    w.set_value(rng.choice(w.options))
+    yield "select_mbti"
+    for query in ("데이터", "소통", "디자"):
+        widget(at.text_input, "직업 검색").set_value(query)
+        yield "query"
+    widget(at.checkbox, "선택 MBTI만 보기").uncheck()
+    yield "show_all"
+    widget(at.text_input, "직업 검색").set_value("")
+    yield "clear_query"
+    page = widget(at.number_input, "페이지")
+    if page is not None:
+        page.set_value(min(2, int(page.proto.max)))
+        yield "next_page"
+    fav = widget(at.button, "즐겨찾기 추가")
+    if fav is not None:
+        fav.click()
+        yield "add_favorite"
+    prep = widget(at.button, "다운로드 준비")
+    if prep is not None:
+        prep.click()
+        yield "export_csv"
+
+
+def color_session(at, rng):
+    yield "open"
+    names = [b.label for b in at.button]
+    for name in rng.sample(names, min(4, len(names))):
+        widget(at.button, name).click()
+        yield "pick_color"
+
+
+APPS = {"main": ("main.py", main_session), "test": ("test.py", color_session), "logic": (None, None)}
+LOGIC_MODULES = "catalog, search, recommend, export, favorites, images, cache, theme, profiling"
+LOGIC_QUERIES = ("", "데이터", "소통", "디자", "코딩 연구", "엔지니어", "교육 상담")
+
+
+def count_elements(node):
+    children = getattr(node, "children", None) or {}
+    return 1 + sum(count_elements(c) for c in children.values())
+
+
+def run_session(app, seed):
+    from streamlit.testing.v1 import AppTest
+
+    script, scenario = APPS[app]
+    at = AppTest.from_file(os.path.join(HERE, script), default_timeout=RUN_TIMEOUT)
+    steps = []
+    for step in scenario(at, random.Random(seed)):
+        t = time.perf_counter()
+        at.run()
+        ms = (time.perf_counter() - t) * 1000
+        if at.exception:
+            raise RuntimeError(f"{app}/{step}: {at.exception[0].message}")
+        steps.append((step, ms, count_elements(at._tree)))
+    return at, steps
+
+
+def percentile(values, p):
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def bench(app, size, sessions, concurrency, workdir):
+    env = "MBTI_CATALOG" if app == "main" else "MBTI_COLOR_DATA"
+    path = catalog_path(size, workdir) if app == "main" else colors_path(size, workdir)
+    if path:
+        os.environ[env] = path
+    else:
+        os.environ.pop(env, None)
+
+    # warm-up: loads the catalog and builds the process-wide caches
+    run_session(app, seed=-1)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda s: run_session(app, s)[1], range(sessions)))
+    steps = [s for session in results for s in session]
+    latencies = [ms for _, ms, _ in steps]
+    slowest = max(steps, key=lambda s: s[1])
+
+    # memory pass: keep the sessions alive and measure what they retain
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    alive = [run_session(app, 1000 + s)[0] for s in range(min(sessions, 3))]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del alive
+
+    return {
+        "app": app, "size": size, "reruns": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "slowest_step": slowest[0],
+        "elements_max": max(n for _, _, n in steps),
+        "session_kb": round(retained / max(1, min(sessions, 3)) / 1024, 1),
+    }
+
+
+def import_ms(modules, repeat=5):
+    # fresh interpreters, so nothing is already imported; minus bare startup
+    def run(code):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True)
+        return (time.perf_counter() - t) * 1000
+    bare = min(run("pass") for _ in range(repeat))
+    return min(run(f"import {modules}") for _ in range(repeat)) - bare
+
+
+def bench_logic(size, sessions, workdir):
+    from catalog import load_catalog
+    from export import csv_bytes_from_jobs
+    from recommend import Recommender
+    from search import SearchIndex, normalize, select_cards
+
+    def build():
+        catalog = load_catalog(path)
+        return catalog, SearchIndex(catalog), Recommender(catalog)
+
+    path = catalog_path(size, workdir)
+    t = time.perf_counter()
+    catalog, index, recommender = build()
+    build_ms = (time.perf_counter() - t) * 1000
+    # memory pass: tracemalloc slows the build down, so it is not timed
+    tracemalloc.start()
+    engine = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del engine
+
+    steps = []
+    rng = random.Random(size)
+    for _ in range(sessions):
+        for query in LOGIC_QUERIES:
+            mbti = rng.choice(catalog.types)
+            t = time.perf_counter()
+            ids = select_cards(catalog, index, mbti, False, normalize(query), recommender)
+            csv_bytes_from_jobs(catalog[i] for i in ids[:12])
+            steps.append((f"query {query!r}", (time.perf_counter() - t) * 1000))
+    latencies = [ms for _, ms in steps]
+    return {
+        "app": "logic", "size": size, "reruns": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "mean_ms": round(statistics.mean(latencies), 1),
+        "slowest_step": max(steps, key=lambda s: s[1])[0],
+        "elements_max": 0,
+        "session_kb": round(retained / 1024, 1),  # the shared engine, not per session
+        "import_ms": round(import_ms(LOGIC_MODULES), 1),
+        "build_ms": round(build_ms, 1),
+    }
+
+
+def result_key(r):
+    return f"{r['app']}:{r['size']}"
+
+
+# fields gated against the baseline: (key, label, unit)
+GATED = (("p95_ms", "p95", "ms"), ("session_kb", "session memory", "KB"), ("elements_max", "elements", ""))
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for r in results:
+        base = baseline.get(result_key(r)) or {}
+        for key, label, unit in GATED:
+            # older baselines may lack a field; those are not gated
+            if key in base and r[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{result_key(r)} {label} {r[key]}{unit} > baseline {base[key]}{unit}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", nargs="+", default=["main", "test"], choices=sorted(APPS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[64, 10000, 100000])
+    parser.add_argument("--color-sizes", nargs="+", type=int, default=[len(COLOR_DATA), 300])
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--baseline", default=os.path.join(HERE, "bench_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.setdefault("MBTI_ANALYTICS_DB", os.path.join(workdir, "analytics.db"))
+        os.environ.setdefault("MBTI_LOG_LEVEL", "WARNING")  # no profile line per scripted rerun
+        for app in args.apps:
+            for size in (args.color_sizes if app == "test" else args.sizes):
+                if app == "logic":
+                    r = bench_logic(size, args.sessions, workdir)
+                else:
+                    r = bench(app, size, args.sessions, args.concurrency, workdir)
+                results.append(r)
+                extra = f" import={r['import_ms']}ms build={r['build_ms']}ms" if app == "logic" else ""
+                print(f"{result_key(r):<12} reruns={r['reruns']:<4} p50={r['p50_ms']:>8}ms "
+                      f"p95={r['p95_ms']:>8}ms p99={r['p99_ms']:>8}ms elements<={r['elements_max']:<5} "
+                      f"session={r['session_kb']}KB slowest={r['slowest_step']}{extra}", flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({result_key(r): r for r in results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Small thread-safe LRU cache with hit/miss counters.
+
+Shared process-wide (via st.cache_resource) by the pieces of the app that
+memoize derived data across reruns and sessions.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """LRU bounded by entry count and, optionally, by total sizeof(value)."""
+
+    def __init__(self, maxsize=128, max_bytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = value
+            if self.max_bytes is not None:
+                self.nbytes += self.sizeof(value)
+            while len(self._data) > self.maxsize or (
+                    self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._data) > 1):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._drop(key)
+
+    def _drop(self, key):
+        value = self._data.pop(key)
+        if self.max_bytes is not None:
+            self.nbytes -= self.sizeof(value)
+        return value
+
+    def get_or_compute(self, key, compute):
+        # compute() runs outside the lock; two sessions racing on the same
+        # key may both compute it, which is harmless for pure results
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def items(self):
+        """Snapshot of (key, value) pairs; unlike get() it leaves order and counters alone."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"size": len(self._data), "maxsize": self.maxsize, "bytes": self.nbytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0}
@@ -0,0 +1,71 @@
+"""
+Card grid as one HTML block
+
+- CARD_TEMPLATE is compiled once; the HTML-escaped static part of each job
+  (icon, title, MBTI badge, majors, description) is memoized per catalog
+  version and id, so a rerun only fills in the image source, fit score
+  and share link
+- a page of cards goes out as a single st.markdown element laid out by the
+  .grid CSS grid (theme.py) instead of rows of st.columns with an
+  st.image + st.markdown per card; interactive controls stay widgets
+- thumbnails on disk are referenced by their static URL (served when
+  server.enableStaticServing is on); uploads and the no-static fallback are
+  inlined as data: URIs
+"""
+
+import base64
+import os
+from html import escape
+from string import Template
+
+from cache import LRUCache
+from images import THUMB_URL
+
+CARD_TEMPLATE = Template("""<div class="job-card">
+<img class="job-media" src="$img" alt="" loading="lazy">
+<div class="job-body">
+<div class="job-head">
+<div>
+<div class="job-title">$icon $title</div>
+<div class="job-meta">MBTI: <strong class="mbti-$mbti">$mbti</strong> · 적합도 $fit</div>
+</div>
+<div style="text-align:right;">
+<div class="job-majors-label">추천 전공</div>
+<div class="job-majors">$majors</div>
+</div>
+</div>
+<div class="job-desc">$desc</div>
+<a class="job-share" href="$share">🔗 공유 링크</a>
+</div>
+</div>""")
+
+
+def card_fields(card):
+    return {
+        "icon": escape(card.get("icon", "")),
+        "title": escape(card["title"]),
+        "mbti": escape(card["mbti"]),
+        "majors": escape(", ".join(card.get("majors", [])) or "–"),
+        "desc": escape(card.get("desc", "")),
+    }
+
+
+def image_src(thumb, static=True):
+    if static and thumb.path:
+        return f"{THUMB_URL}/{os.path.basename(thumb.path)}"
+    return f"data:{thumb.mime};base64,{base64.b64encode(thumb.data).decode('ascii')}"
+
+
+class CardRenderer:
+    def __init__(self, maxsize=4096):
+        self.fields = LRUCache(maxsize=maxsize)  # (catalog version, id) -> escaped fields
+
+    def card(self, version, card_id, card, img, fit, share):
+        fields = self.fields.get_or_compute((version, card_id), lambda: card_fields(card))
+        return CARD_TEMPLATE.substitute(fields, img=escape(img), fit=f"{fit:.0%}", share=escape(share))
+
+    def grid(self, cards_html):
+        return f'<div class="grid">{"".join(cards_html)}</div>'
+
+    def stats(self):
+        return self.fields.stats()
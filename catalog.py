@@ -0,0 +1,404 @@
+"""
+Job catalog backends
+
+- BuiltinCatalog: the curated MBTI_JOBS dict below (default)
+- PackedCatalog: a compact on-disk file, memory-mapped and decoded lazily,
+  so one process-wide instance serves every session without copying rows
+- load_catalog(path) picks the backend; write_packed() produces the file
+- BuiltinCatalog.from_cards() wraps an already built card list (used by
+  reload.py to publish a diffed snapshot)
+
+Packed file layout (all integers little-endian uint32):
+  header   MAGIC, sha1(body), n_rows, n_strings, n_list_items
+  strings  n_strings + 1 byte offsets, then the UTF-8 blob (each distinct
+           string is stored once, so repeated majors/skills/types are shared)
+  rows     per job: title, icon, desc, img_q, mbti (string ids),
+           majors_start, majors_len, skills_start, skills_len
+  lists    string ids referenced by the majors/skills ranges
+
+Usage:
+  python catalog.py jobs.mcat              # pack the built-in catalog
+  python catalog.py jobs.mcat source.json  # pack a {"MBTI": [job, ...]} JSON file
+  python catalog.py jobs.json              # write the built-in catalog as editable JSON
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"MCAT\x01\x00\x00\x00"
+HEADER = struct.Struct("<8s20sIII")
+ROW = struct.Struct("<9I")
+
+# -----------------------
+# MBTI Data (16 types) - each has list of 4 jobs with details
+# For images we use unsplash queries; in production replace with curated assets.
+# -----------------------
+MBTI_JOBS = {
+    "ISTJ": [
+        {"title":"회계사", "icon":"📊", "desc":"정확성과 윤리로 재무와 세무를 관리하는 전문가.",
+         "majors":["회계학","경영학"], "skills":["엑셀·재무회계","세무지식"], "img_q":"accounting office finance"},
+        {"title":"데이터 분석가", "icon":"📈", "desc":"데이터에서 인사이트를 추출해 의사결정을 돕는 역할.",
+         "majors":["통계학","컴퓨터공학"], "skills":["SQL","통계분석"], "img_q":"data analytics office"},
+        {"title":"공무원", "icon":"🏛️", "desc":"안정적인 조직에서 공공서비스를 제공하는 직무.",
+         "majors":["행정학","법학"], "skills":["문서작성","정책이해"], "img_q":"government office building"},
+        {"title":"품질관리자", "icon":"🛠️", "desc":"제품·서비스 품질 유지와 개선을 책임지는 전문가.",
+         "majors":["산업공학","기계공학"], "skills":["QC","문제해결"], "img_q":"quality control manufacturing"}
+    ],
+    "ISFJ": [
+        {"title":"교사","icon":"📚","desc":"학생을 돌보고 가르치며 성장의 기반을 만드는 직업.",
+         "majors":["교육학"], "skills":["수업기획","소통"], "img_q":"teacher classroom"},
+        {"title":"간호사","icon":"🩺","desc":"환자 돌봄과 의료지원에서 핵심 역할을 수행.",
+         "majors":["간호학"], "skills":["환자관리","응급처치"], "img_q":"nurse hospital care"},
+        {"title":"사회복지사","icon":"🤝","desc":"복지서비스로 취약계층의 삶을 지원하는 전문가.",
+         "majors":["사회복지학"], "skills":["상담","자원연계"], "img_q":"community social work"},
+        {"title":"도서관 사서","icon":"📖","desc":"정보자원의 관리와 이용자 지원을 담당.",
+         "majors":["문헌정보학"], "skills":["자료관리","정보검색"], "img_q":"library bookshelves"}
+    ],
+    "INFJ": [
+        {"title":"상담사","icon":"🧠","desc":"개인의 내면을 이해하고 변화를 돕는 심리전문가.",
+         "majors":["심리학"], "skills":["경청·상담기술","심리평가"], "img_q":"therapy counseling"},
+        {"title":"작가","icon":"✍️","desc":"사유와 감성을 글로 풀어내는 창작자.",
+         "majors":["문예창작","국문학"], "skills":["글쓰기","관찰력"], "img_q":"writer desk creative"},
+        {"title":"심리학자","icon":"🔬","desc":"심리 연구를 통해 인간 행동을 과학적으로 탐구.",
+         "majors":["심리학"], "skills":["연구설계","통계분석"], "img_q":"psychology lab research"},
+        {"title":"예술가","icon":"🎨","desc":"감성·메시지를 이미지로 표현하는 창작자.",
+         "majors":["미술","디자인"], "skills":["크리에이티브","시각화"], "img_q":"artist studio painting"}
+    ],
+    "INTJ": [
+        {"title":"연구원","icon":"🔍","desc":"전문 분야의 문제를 풀고 지식을 확장하는 역할.",
+         "majors":["전공특화"], "skills":["논리적사고","실험설계"], "img_q":"scientist lab research"},
+        {"title":"전략기획가","icon":"📋","desc":"조직의 장기 목표와 실행계획을 설계.",
+         "majors":["경영학","경제학"], "skills":["전략수립","데이터해석"], "img_q":"strategy planning"},
+        {"title":"프로그래머","icon":"💻","desc":"시스템/서비스를 설계·구현하여 문제를 해결.",
+         "majors":["컴퓨터공학"], "skills":["코딩","시스템설계"], "img_q":"programmer coding laptop"},
+        {"title":"변호사","icon":"⚖️","desc":"법적 문제 해결과 권리 보호를 담당.",
+         "majors":["법학"], "skills":["논리·글쓰기","법리해석"], "img_q":"lawyer books courtroom"}
+    ],
+    "ISTP": [
+        {"title":"엔지니어","icon":"⚙️","desc":"현실 문제를 기술적으로 해결하는 실무전문가.",
+         "majors":["기계·전기·전자"], "skills":["기술분석","현장해결"], "img_q":"engineer workshop tools"},
+        {"title":"경찰관","icon":"🚓","desc":"공공안전과 질서유지를 책임지는 직업.",
+         "majors":["경찰행정"], "skills":["신속대응","위기관리"], "img_q":"police patrol"},
+        {"title":"항공 정비사","icon":"✈️","desc":"항공기의 안전운항을 위해 정비·점검 수행.",
+         "majors":["항공정비"], "skills":["정비기술","세심함"], "img_q":"aircraft maintenance hangar"},
+        {"title":"사진작가","icon":"📷","desc":"시각을 통해 순간을 예술화하는 창작자.",
+         "majors":["사진예술"], "skills":["구도·디자인","촬영기술"], "img_q":"photographer camera portrait"}
+    ],
+    "ISFP": [
+        {"title":"디자이너","icon":"🎨","desc":"공간·시각을 아름답게 설계하는 창작자.",
+         "majors":["디자인"], "skills":["색채·레이아웃","창의력"], "img_q":"designer studio workspace"},
+        {"title":"작곡가","icon":"🎼","desc":"음악으로 감정을 구성하고 전달하는 전문가.",
+         "majors":["음악"], "skills":["작곡·편곡","음악이론"], "img_q":"composer studio music"},
+        {"title":"요리사","icon":"👨‍🍳","desc":"미각과 미감을 결합해 음식을 창조.",
+         "majors":["조리학"], "skills":["조리기술","프레젠테이션"], "img_q":"chef kitchen plating"},
+        {"title":"치유사","icon":"🌿","desc":"몸과 마음의 회복을 돕는 치료적 역할.",
+         "majors":["대체의학"], "skills":["공감·케어","테라피기법"], "img_q":"healing therapy wellness"}
+    ],
+    "INFP": [
+        {"title":"소설가","icon":"📖","desc":"내면의 상상과 메시지를 글로 구현하는 작가.",
+         "majors":["문예창작"], "skills":["창의적서사","문장력"], "img_q":"novelist writing desk"},
+        {"title":"상담가","icon":"🧠","desc":"정서적 지원과 변화의 촉진을 돕는 역할.",
+         "majors":["심리학"], "skills":["경청·공감","상담기법"], "img_q":"counseling session"},
+        {"title":"예술가","icon":"🎭","desc":"감정과 아이디어를 예술작업으로 표현.",
+         "majors":["미술·연극"], "skills":["표현력","창작"], "img_q":"artist gallery creative"},
+        {"title":"환경운동가","icon":"🌏","desc":"지구와 사회를 위한 실천과 캠페인을 이끎.",
+         "majors":["환경학"], "skills":["조직화","캠페인기획"], "img_q":"environment activism nature"}
+    ],
+    "INTP": [
+        {"title":"개발자","icon":"💻","desc":"논리적 문제를 코드로 해결하고 제품을 완성.",
+         "majors":["컴퓨터공학"], "skills":["알고리즘·코딩","시스템디자인"], "img_q":"developer coding laptop"},
+        {"title":"과학자","icon":"🔬","desc":"자연·현상을 분석하고 지식을 확장.",
+         "majors":["자연과학"], "skills":["실험·자료해석","논문작성"], "img_q":"science laboratory research"},
+        {"title":"발명가","icon":"💡","desc":"새로운 아이디어를 제품·서비스로 구현.",
+         "majors":["융합공학"], "skills":["문제발견","프로토타이핑"], "img_q":"invention prototype workshop"},
+        {"title":"교수","icon":"🎓","desc":"연구와 교육을 통해 지식을 전파.",
+         "majors":["전공심화"], "skills":["연구·강의","논리정리"], "img_q":"university lecture hall"}
+    ],
+    "ESTP": [
+        {"title":"기업가","icon":"🏢","desc":"실행력으로 기회를 포착해 사업을 성장시킴.",
+         "majors":["경영학"], "skills":["리스크테이킹","영업"], "img_q":"entrepreneur startup office"},
+        {"title":"영업사원","icon":"💼","desc":"현장에서 고객 가치를 만들고 성과를 창출.",
+         "majors":["경영·마케팅"], "skills":["소통·협상","영업전략"], "img_q":"sales meeting handshake"},
+        {"title":"스포츠 코치","icon":"🏅","desc":"선수의 기량을 끌어올리고 전략을 설계.",
+         "majors":["체육"], "skills":["훈련설계","동기부여"], "img_q":"sports coach training"},
+        {"title":"파일럿","icon":"🛫","desc":"항공 운항과 승객 안전을 책임지는 전문조종사.",
+         "majors":["항공운항"], "skills":["조종술·응급대응","공간지각"], "img_q":"pilot cockpit flying"}
+    ],
+    "ESFP": [
+        {"title":"배우","icon":"🎬","desc":"연기와 표현으로 관객과 감정을 나누는 직업.",
+         "majors":["연기·무대"], "skills":["연기·표현","대중소통"], "img_q":"actor stage performance"},
+        {"title":"이벤트 기획자","icon":"🎉","desc":"크고 작은 행사를 창의적으로 실행.",
+         "majors":["문화기획"], "skills":["프로젝트관리","현장운영"], "img_q":"event planning stage"},
+        {"title":"여행 가이드","icon":"🗺️","desc":"현장에서 경험을 전달하고 여행을 완성.",
+         "majors":["관광·문화"], "skills":["설명·안내","문제대응"], "img_q":"tour guide travel"},
+        {"title":"스타일리스트","icon":"👗","desc":"이미지와 패션을 통해 사람을 연출.",
+         "majors":["패션"], "skills":["스타일링","트렌드분석"], "img_q":"stylist fashion studio"}
+    ],
+    "ENFP": [
+        {"title":"마케터","icon":"📢","desc":"창의적 스토리로 브랜드와 고객을 연결.",
+         "majors":["마케팅"], "skills":["콘텐츠기획","브랜딩"], "img_q":"marketing creative team"},
+        {"title":"창업가","icon":"🚀","desc":"아이디어를 현실로 만들고 조직을 성장.",
+         "majors":["경영"], "skills":["기획·리더십","제품개발"], "img_q":"startup team brainstorming"},
+        {"title":"방송인","icon":"🎙️","desc":"대중과 소통하며 영향력을 만드는 직업.",
+         "majors":["미디어"], "skills":["발화력","콘텐츠제작"], "img_q":"podcast studio broadcast"},
+        {"title":"광고 기획자","icon":"🖌️","desc":"광고 캠페인으로 메시지를 창작·전달.",
+         "majors":["광고·마케팅"], "skills":["콘셉트구성","카피라이팅"], "img_q":"advertising creative concept"}
+    ],
+    "ENTP": [
+        {"title":"컨설턴트","icon":"💼","desc":"문제의 본질을 찾아 해결책을 제시.",
+         "majors":["경영·전공"], "skills":["분석·프레젠테이션","전략"], "img_q":"consulting meeting"},
+        {"title":"벤처사업가","icon":"🏢","desc":"혁신적 사업으로 시장을 도전·개척.",
+         "majors":["경영"], "skills":["네트워킹","제품시장적합성"], "img_q":"venture startup office"},
+        {"title":"정치가","icon":"🏛️","desc":"정책과 공공 이슈를 만들어가는 리더.",
+         "majors":["정치외교"], "skills":["협상·연설","정책이해"], "img_q":"politics debate podium"},
+        {"title":"프로듀서","icon":"🎬","desc":"콘텐츠의 기획·제작을 총괄하는 역할.",
+         "majors":["미디어·예술"], "skills":["프로젝트관리","콘텐츠기획"], "img_q":"producer studio production"}
+    ],
+    "ESTJ": [
+        {"title":"관리자","icon":"📊","desc":"조직운영과 성과관리를 책임지는 리더.",
+         "majors":["경영"], "skills":["운영관리","리더십"], "img_q":"office manager meeting"},
+        {"title":"군인","icon":"🪖","desc":"안보와 규율을 바탕으로 국가를 수호.",
+         "majors":["군사학"], "skills":["규율·체력","팀워크"], "img_q":"soldier uniform training"},
+        {"title":"영업 관리자","icon":"📈","desc":"영업팀을 관리하며 목표를 달성.",
+         "majors":["경영·마케팅"], "skills":["성과관리","전략적영업"], "img_q":"sales manager office"},
+        {"title":"프로젝트 매니저","icon":"📋","desc":"프로젝트 기획·실행·종료를 총괄.",
+         "majors":["경영·IT"], "skills":["PM기술","리스크관리"], "img_q":"project manager planning"}
+    ],
+    "ESFJ": [
+        {"title":"간호사","icon":"🩺","desc":"환자 돌봄과 의료지원의 출발점에서 활약.",
+         "majors":["간호학"], "skills":["환자케어","팀워크"], "img_q":"nurse caring patient"},
+        {"title":"교사","icon":"📚","desc":"학생의 성장을 돕는 교육현장의 핵심.",
+         "majors":["교육학"], "skills":["수업설계","소통"], "img_q":"teacher school classroom"},
+        {"title":"HR 담당자","icon":"👥","desc":"조직문화와 인재관리를 담당.",
+         "majors":["경영·심리"], "skills":["채용·평가","커뮤니케이션"], "img_q":"hr recruitment office"},
+        {"title":"이벤트 플래너","icon":"🎉","desc":"사람을 중심으로 행사를 기획·운영.",
+         "majors":["문화기획"], "skills":["조직관리","현장운영"], "img_q":"event planner stage"}
+    ],
+    "ENFJ": [
+        {"title":"리더십 코치","icon":"🎯","desc":"팀과 개인의 성장과 협업을 돕는 전문가.",
+         "majors":["심리·교육"], "skills":["코칭","조직개발"], "img_q":"leadership coaching"},
+        {"title":"방송인","icon":"🎙️","desc":"메시지를 전달하고 공감을 만드는 역할.",
+         "majors":["미디어"], "skills":["화술","콘텐츠제작"], "img_q":"broadcaster studio"},
+        {"title":"강사","icon":"📝","desc":"주제 전문성을 교육으로 전달하는 직업.",
+         "majors":["전공심화"], "skills":["교육설계","전달력"], "img_q":"teacher lecture classroom"},
+        {"title":"외교관","icon":"🌐","desc":"국가 간 협상을 통해 관계를 설계.",
+         "majors":["국제관계"], "skills":["언어·협상","국제정책"], "img_q":"diplomat meeting"}
+    ],
+    "ENTJ": [
+        {"title":"경영자","icon":"🏢","desc":"조직의 비전과 전술을 결정하는 최고책임자.",
+         "majors":["경영"], "skills":["전략수립","리더십"], "img_q":"ceo office meeting"},
+        {"title":"변호사","icon":"⚖️","desc":"법률 문제의 해결과 권리 보호를 담당.",
+         "majors":["법학"], "skills":["논리·소송","문서작성"], "img_q":"law firm courtroom"},
+        {"title":"CEO","icon":"💼","desc":"기업 전체 운영과 성과에 책임을 지는 역할.",
+         "majors":["경영"], "skills":["의사결정","조직운영"], "img_q":"business leader office"},
+        {"title":"전략 컨설턴트","icon":"📊","desc":"기업의 핵심 문제를 진단하고 해법 제시.",
+         "majors":["경영·경제"], "skills":["분석·전략수립","프레젠테이션"], "img_q":"strategy consultant meeting"}
+    ]
+}
+
+# -----------------------
+# Backends
+# -----------------------
+class Catalog:
+    """Read-only sequence of job cards (dicts with an added "mbti" key)."""
+
+    version = ""
+    types = ()
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __getitem__(self, i):
+        raise NotImplementedError
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def ids_for_type(self, mbti):
+        raise NotImplementedError
+
+    def by_type(self, mbti):
+        return [self[i] for i in self.ids_for_type(mbti)]
+
+
+def job_card(job, mbti):
+    item = dict(job)
+    item["mbti"] = mbti
+    item["img_q"] = job.get("img_q", job["title"])
+    return item
+
+
+def catalog_version(jobs_by_type):
+    blob = json.dumps(jobs_by_type, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+class BuiltinCatalog(Catalog):
+    def __init__(self, jobs_by_type=None):
+        jobs_by_type = MBTI_JOBS if jobs_by_type is None else jobs_by_type
+        self.types = tuple(jobs_by_type.keys())
+        self._cards = []
+        self._type_ids = {}
+        for mbti_type, jobs in jobs_by_type.items():
+            for job in jobs:
+                self._type_ids.setdefault(mbti_type, []).append(len(self._cards))
+                self._cards.append(job_card(job, mbti_type))
+        self.version = catalog_version(jobs_by_type)
+
+    @classmethod
+    def from_cards(cls, cards, types, version):
+        """Catalog over `cards` as given (ids are list positions)."""
+        self = cls.__new__(cls)
+        self.types = tuple(types)
+        self._cards = cards
+        self._type_ids = {}
+        for i, card in enumerate(cards):
+            self._type_ids.setdefault(card["mbti"], []).append(i)
+        self.version = version
+        return self
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __getitem__(self, i):
+        return self._cards[i]
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def ids_for_type(self, mbti):
+        return self._type_ids.get(mbti, [])
+
+
+class PackedCatalog(Catalog):
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buf) < HEADER.size:
+            raise ValueError(f"{path}: truncated packed job catalog")
+        magic, digest, self._n_rows, n_strings, n_items = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a packed job catalog")
+        # a half-written or corrupted body fails here instead of in a later row read
+        with memoryview(self._buf) as view:
+            if hashlib.sha1(view[HEADER.size:]).digest() != digest:
+                raise ValueError(f"{path}: packed job catalog checksum mismatch")
+        self.version = digest.hex()[:12]
+        self._str_offsets = HEADER.size
+        self._blob = self._str_offsets + 4 * (n_strings + 1)
+        blob_len = self._u32(self._str_offsets + 4 * n_strings)
+        self._rows = self._blob + blob_len
+        self._lists = self._rows + ROW.size * self._n_rows
+        # decoded strings are shared by every row/session that touches them
+        self._strings = [None] * n_strings
+        self._type_ids = {}
+        for i in range(self._n_rows):
+            mbti = self._str(self._u32(self._rows + ROW.size * i + 16))
+            self._type_ids.setdefault(mbti, []).append(i)
+        self.types = tuple(self._type_ids)
+
+    def _u32(self, pos):
+        return struct.unpack_from("<I", self._buf, pos)[0]
+
+    def _str(self, sid):
+        s = self._strings[sid]
+        if s is None:
+            start, end = struct.unpack_from("<II", self._buf, self._str_offsets + 4 * sid)
+            s = self._strings[sid] = self._buf[self._blob + start:self._blob + end].decode("utf-8")
+        return s
+
+    def _list(self, start, count):
+        ids = struct.unpack_from(f"<{count}I", self._buf, self._lists + 4 * start)
+        return [self._str(sid) for sid in ids]
+
+    def __len__(self):
+        return self._n_rows
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._n_rows:
+            raise IndexError(i)
+        title, icon, desc, img_q, mbti, m0, mn, s0, sn = ROW.unpack_from(self._buf, self._rows + ROW.size * i)
+        return {"title": self._str(title), "icon": self._str(icon), "desc": self._str(desc),
+                "majors": self._list(m0, mn), "skills": self._list(s0, sn),
+                "img_q": self._str(img_q), "mbti": self._str(mbti)}
+
+    def ids_for_type(self, mbti):
+        return self._type_ids.get(mbti, [])
+
+
+# -----------------------
+# Loading / packing
+# -----------------------
+def load_catalog(path=None):
+    if not path:
+        return BuiltinCatalog()
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return BuiltinCatalog(json.load(f))
+    return PackedCatalog(path)
+
+
+def write_packed(cards, path):
+    """Pack an iterable of job cards (each with an "mbti" key) into `path`."""
+    string_ids = {}
+    strings = []
+
+    def intern(s):
+        sid = string_ids.get(s)
+        if sid is None:
+            sid = string_ids[s] = len(strings)
+            strings.append(s.encode("utf-8"))
+        return sid
+
+    rows = bytearray()
+    items = []
+    n_rows = 0
+    for card in cards:
+        majors = [intern(m) for m in card.get("majors", [])]
+        skills = [intern(s) for s in card.get("skills", [])]
+        rows += ROW.pack(intern(card["title"]), intern(card.get("icon", "")), intern(card.get("desc", "")),
+                         intern(card.get("img_q", card["title"])), intern(card["mbti"]),
+                         len(items), len(majors), len(items) + len(majors), len(skills))
+        items += majors + skills
+        n_rows += 1
+
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+    body = b"".join([struct.pack(f"<{len(offsets)}I", *offsets), *strings, bytes(rows),
+                     struct.pack(f"<{len(items)}I", *items)])
+    # written next to the target and renamed over it: a reader that still has
+    # the old file mapped keeps its pages (truncating it in place would SIGBUS)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, hashlib.sha1(body).digest(), n_rows, len(strings), len(items)))
+        f.write(body)
+    os.replace(tmp, path)
+    return n_rows
+
+
+def write_json(cards, path):
+    by_type = {}
+    for card in cards:
+        job = dict(card)
+        by_type.setdefault(job.pop("mbti"), []).append(job)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(by_type, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+    return sum(len(jobs) for jobs in by_type.values())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+    source = load_catalog(sys.argv[2] if len(sys.argv) == 3 else None)
+    write = write_json if sys.argv[1].endswith(".json") else write_packed
+    n = write(source, sys.argv[1])
+    print(f"wrote {n} jobs to {sys.argv[1]}")
@@ -0,0 +1,166 @@
+"""
+Randomized check of the incremental catalog reload (reload.py)
+
+Starting from a generated JSON-shaped catalog, each round applies random
+edits (edited fields, added / removed / moved / reordered jobs, repeated
+titles, emptied types) and reloads it with apply_diff, chaining the
+snapshots as the running app does. Every round checks that:
+- the diffed catalog holds the same jobs, types and version as a fresh
+  BuiltinCatalog of the edited data
+- SearchIndex.updated equals SearchIndex built from scratch over the same
+  ids (jamo, every posting table and the results of sampled queries)
+- FacetIndex.updated equals a fresh FacetIndex (bitsets, totals, value
+  order, type bits)
+- the previous snapshot's index and facets were not modified (copy-on-write)
+
+Usage:
+  python check_reload.py                        # 500 jobs, 100 rounds, seed 0
+  python check_reload.py --jobs 2000 --rounds 50 --seed 7
+      -> exit code 1 at the first mismatch
+"""
+
+import argparse
+import copy
+import random
+import sys
+
+from catalog import BuiltinCatalog
+from facets import FacetIndex
+from gen_catalog import generate_jobs
+from reload import apply_diff, build_snapshot
+from search import FIELDS, SearchIndex, field_text, lead_key
+
+
+def group_by_type(cards):
+    jobs_by_type = {}
+    for card in cards:
+        job = dict(card)
+        jobs_by_type.setdefault(job.pop("mbti"), []).append(job)
+    return jobs_by_type
+
+
+def mutate(rng, jobs_by_type, pool, size):
+    """Apply a few random edits in place; the catalog stays around `size` jobs."""
+    for _ in range(rng.randint(1, 8)):
+        types = [t for t, jobs in jobs_by_type.items() if jobs]
+        t = rng.choice(types)
+        jobs = jobs_by_type[t]
+        i = rng.randrange(len(jobs))
+        grow = sum(map(len, jobs_by_type.values())) < size
+        op = rng.choice(("title", "desc", "majors", "skills", "icon", "move", "reorder", "empty")
+                        + (("add", "add", "repeat") if grow else ("remove", "remove", "remove")))
+        if op == "title":
+            jobs[i]["title"] = rng.choice(pool)["title"]
+        elif op == "desc":
+            jobs[i]["desc"] = rng.choice(pool)["desc"]
+        elif op in ("majors", "skills", "icon"):
+            jobs[i][op] = rng.choice(pool)[op]
+        elif op == "add":
+            job = dict(rng.choice(pool))
+            job.pop("mbti")
+            jobs.insert(rng.randint(0, len(jobs)), job)
+        elif op == "repeat":
+            jobs.append(dict(jobs[i]))  # same type and title: told apart by position
+        elif op == "remove":
+            del jobs[i]
+        elif op == "move":
+            jobs_by_type.setdefault(rng.choice(list(jobs_by_type)), []).append(jobs.pop(i))
+        elif op == "reorder":
+            rng.shuffle(jobs)
+        elif op == "empty" and len(types) > 1 and rng.random() < 0.1:
+            jobs.clear()
+
+
+def index_state(index):
+    return (list(index.cards), index._jamo, index._bigrams, index._nexts, index._leads)
+
+
+def facet_state(facets):
+    return (facets.n, facets.all_bits, {f: list(v.items()) for f, v in facets.bits.items()},
+            {f: list(v.items()) for f, v in facets.totals.items()}, facets.type_bits)
+
+
+def queries(rng, catalog, n=20):
+    out = []
+    for _ in range(n):
+        text = field_text(catalog[rng.randrange(len(catalog))], rng.choice(FIELDS)[0]).replace(" ", "")
+        if not text:
+            continue
+        start = rng.randrange(len(text))
+        q = text[start:start + rng.randint(1, 4)]
+        if rng.random() < 0.3:
+            q = q[:-1] + lead_key(q[-1])  # last syllable still being typed
+        out.append(q)
+    return out
+
+
+def check_round(rng, previous, snapshot, jobs_by_type, reference):
+    """Check one reload against a full rebuild.
+
+    reference is the full rebuild (index, facets) of `previous`, built
+    independently, so it also shows whether the reload modified `previous`.
+    Returns (mismatch descriptions, the full rebuild of `snapshot`).
+    """
+    errors = []
+    fresh = BuiltinCatalog(jobs_by_type)
+    catalog = snapshot.catalog
+    key = repr
+    if sorted(map(key, catalog)) != sorted(map(key, fresh)):
+        errors.append("catalog: jobs differ from a fresh load")
+    if (catalog.version, catalog.types) != (fresh.version, fresh.types):
+        errors.append("catalog: version or types differ from a fresh load")
+    for t in catalog.types:
+        if any(catalog[i]["mbti"] != t for i in catalog.ids_for_type(t)):
+            errors.append(f"catalog: ids_for_type({t}) holds other types")
+
+    full = SearchIndex(catalog), FacetIndex(catalog)
+    if index_state(snapshot.index) != index_state(full[0]):
+        errors.append("search: updated index differs from a full build")
+    for q in queries(rng, catalog) if len(catalog) else ():
+        if snapshot.index.search(q) != full[0].search(q):
+            errors.append(f"search: results for {q!r} differ")
+    if facet_state(snapshot.facets) != facet_state(full[1]):
+        errors.append("facets: updated index differs from a full build")
+
+    if (index_state(previous.index) != index_state(reference[0])
+            or facet_state(previous.facets) != facet_state(reference[1])):
+        errors.append("copy-on-write: the previous snapshot was modified")
+    return errors, full
+
+
+def run(n_jobs, rounds, seed):
+    rng = random.Random(seed)
+    pool = list(generate_jobs(n_jobs * 2, seed))
+    jobs_by_type = group_by_type(pool[:n_jobs])
+    snapshot = build_snapshot(BuiltinCatalog(jobs_by_type))
+    reference = SearchIndex(snapshot.catalog), FacetIndex(snapshot.catalog)
+    totals = {"added": 0, "edited": 0, "removed": 0}
+    for r in range(rounds):
+        jobs_by_type = copy.deepcopy(jobs_by_type)
+        mutate(rng, jobs_by_type, pool, n_jobs)
+        new, counts = apply_diff(snapshot, jobs_by_type)
+        errors, reference = check_round(rng, snapshot, new, jobs_by_type, reference)
+        if errors:
+            print(f"round {r} (seed {seed}, {counts}):")
+            for e in errors:
+                print(f"  {e}")
+            return False
+        for k, v in counts.items():
+            totals[k] += v
+        snapshot = new
+    print(f"{rounds} rounds OK ({len(snapshot.catalog)} jobs now; "
+          f"{totals['added']} added, {totals['edited']} edited, {totals['removed']} removed)")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Randomized check: incremental reload equals a full rebuild")
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sys.exit(0 if run(args.jobs, args.rounds, args.seed) else 1)
+
+
+if __name__ == "__main__":
+    main()
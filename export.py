@@ -0,0 +1,107 @@
+"""
+Job list export (CSV / XLSX / Parquet)
+
+- rows are produced from any iterable of job dicts (catalog, filtered ids,
+  favorites) and written in chunks, never as one big in-memory table
+- the output is built in memory as one bytes object: st.download_button
+  needs the whole file in memory, so spooling it to disk first saved
+  nothing. What stays lazy is when it is built (main.py builds an export
+  only after its "준비" button is clicked)
+- CSV is UTF-8 with BOM so Excel opens the Korean text correctly
+- XLSX needs openpyxl, Parquet needs pyarrow; both are optional and only
+  offered when installed (see available_formats)
+"""
+
+import codecs
+import csv
+import io
+from itertools import islice
+
+COLUMNS = ["MBTI", "Job Title", "Short Description", "Icon", "Recommended Majors", "Key Skills"]
+CHUNK_ROWS = 1000
+
+
+def job_row(job, mbti_label=None):
+    return [mbti_label or job.get("mbti", ""), job["title"], job.get("desc", ""), job.get("icon", ""),
+            "; ".join(job.get("majors", [])), "; ".join(job.get("skills", []))]
+
+
+def chunked(jobs, mbti_label=None, chunk_rows=CHUNK_ROWS):
+    rows = (job_row(job, mbti_label) for job in jobs)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv_rows(header, row_chunks):
+    """Yield CSV byte chunks (BOM + header first) for an iterable of row lists."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    yield codecs.BOM_UTF8 + buf.getvalue().encode("utf-8")
+    for chunk in row_chunks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+
+
+def iter_csv(jobs, mbti_label=None, chunk_rows=CHUNK_ROWS):
+    """Yield the job CSV as encoded byte chunks."""
+    return iter_csv_rows(COLUMNS, chunked(jobs, mbti_label, chunk_rows))
+
+
+def csv_bytes_from_jobs(jobs, mbti_label=None):
+    return b"".join(iter_csv(jobs, mbti_label))
+
+
+def write_csv(jobs, out, mbti_label=None):
+    for part in iter_csv(jobs, mbti_label):
+        out.write(part)
+
+
+def write_xlsx(jobs, out, mbti_label=None):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("jobs")
+    ws.append(COLUMNS)
+    for chunk in chunked(jobs, mbti_label):
+        for row in chunk:
+            ws.append(row)
+    wb.save(out)
+
+
+def write_parquet(jobs, out, mbti_label=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.string()) for name in COLUMNS])
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunked(jobs, mbti_label):
+            columns = list(zip(*chunk))
+            writer.write_table(pa.table([pa.array(col, pa.string()) for col in columns], schema=schema))
+
+
+# name -> (label, file extension, mime type, writer, module required)
+FORMATS = {
+    "csv": ("CSV", "csv", "text/csv", write_csv, None),
+    "xlsx": ("Excel (XLSX)", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+             write_xlsx, "openpyxl"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet", write_parquet, "pyarrow"),
+}
+
+
+def available_formats():
+    from importlib.util import find_spec
+
+    return [name for name, spec in FORMATS.items() if spec[4] is None or find_spec(spec[4]) is not None]
+
+
+def export_bytes(jobs, fmt="csv", mbti_label=None):
+    """`jobs` in `fmt` as one bytes object."""
+    out = io.BytesIO()
+    FORMATS[fmt][3](jobs, out, mbti_label)
+    return out.getvalue()
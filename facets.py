@@ -0,0 +1,133 @@
+"""
+Facet filters over the catalog (major, skill, icon, MBTI letters)
+
+- every facet value has a precomputed bitset over catalog ids (a Python
+  int, bit i = job i), built once per catalog version with NumPy packbits
+- a selection is OR within a facet and AND across facets, so any
+  combination is a few big-int & / | operations
+- live counts: for each facet, the other facets (plus the query / type
+  restriction) are intersected once, then each value costs one & and a
+  popcount (int.bit_count)
+- updated() flips only the bits of changed ids for an edited catalog
+"""
+
+import numpy as np
+
+from recommend import AXES
+
+FACETS = ("major", "skill", "icon") + AXES
+
+
+def to_bits(ids, n):
+    mask = np.zeros(n, dtype=bool)
+    mask[np.asarray(ids, dtype=np.int64)] = True
+    return mask_to_bits(mask)
+
+
+def mask_to_bits(mask):
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def bits_to_mask(bits, n):
+    raw = bits.to_bytes((n + 7) // 8, "little")
+    return np.unpackbits(np.frombuffer(raw, dtype=np.uint8), count=n, bitorder="little").astype(bool)
+
+
+class Selection:
+    """Ids allowed by a facet selection: sorted ids plus an O(1) membership mask."""
+
+    def __init__(self, bits, n):
+        self.bits = bits
+        self.mask = bits_to_mask(bits, n)
+        self.ids = np.flatnonzero(self.mask)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, i):
+        return bool(self.mask[i])
+
+
+def card_values(card):
+    """(facet, value) pairs of one job."""
+    for major in dict.fromkeys(card.get("majors", [])):
+        yield "major", major
+    for skill in dict.fromkeys(card.get("skills", [])):
+        yield "skill", skill
+    yield "icon", card.get("icon", "")
+    yield from zip(AXES, card["mbti"])
+
+
+class FacetIndex:
+    def __init__(self, catalog):
+        self.n = n = len(catalog)
+        self.all_bits = (1 << n) - 1
+        # id lists per value (one dense mask per value would cost values x jobs bytes)
+        ids = {facet: {} for facet in FACETS}
+        for i, card in enumerate(catalog):
+            for facet, value in card_values(card):
+                ids[facet].setdefault(value, []).append(i)
+        # facet -> {value: bitset}, values by catalog-wide count (most common first)
+        self.bits = {}
+        self.totals = {}
+        for facet, by_value in ids.items():
+            order = sorted(by_value, key=lambda v: (-len(by_value[v]), v))
+            self.bits[facet] = {v: to_bits(by_value[v], n) for v in order}
+            self.totals[facet] = {v: len(by_value[v]) for v in order}
+        self.type_bits = {t: to_bits(catalog.ids_for_type(t), n) for t in catalog.types}
+
+    def updated(self, catalog, old_catalog, changed):
+        """Index for `catalog` where only ids in `changed` (and ids past the new end) differ from old_catalog."""
+        new = FacetIndex.__new__(FacetIndex)
+        new.n = n = len(catalog)
+        new.all_bits = (1 << n) - 1
+        new.bits = {facet: dict(values) for facet, values in self.bits.items()}
+        new.totals = {facet: dict(values) for facet, values in self.totals.items()}
+        stale = [i for i in changed if i < len(old_catalog)] + list(range(n, len(old_catalog)))
+        for i in stale:
+            for facet, value in card_values(old_catalog[i]):
+                new.bits[facet][value] &= ~(1 << i)
+                new.totals[facet][value] -= 1
+        for i in changed:
+            for facet, value in card_values(catalog[i]):
+                new.bits[facet][value] = new.bits[facet].get(value, 0) | (1 << i)
+                new.totals[facet][value] = new.totals[facet].get(value, 0) + 1
+        for facet in FACETS:
+            totals = {v: t for v, t in new.totals[facet].items() if t > 0}
+            order = sorted(totals, key=lambda v: (-totals[v], v))  # most common first, as in a full build
+            new.bits[facet] = {v: new.bits[facet][v] for v in order}
+            new.totals[facet] = {v: totals[v] for v in order}
+        new.type_bits = {t: to_bits(catalog.ids_for_type(t), n) for t in catalog.types}
+        return new
+
+    def values(self, facet):
+        return list(self.bits[facet])
+
+    def facet_bits(self, facet, chosen):
+        """OR of the chosen values of one facet; no choice means no restriction."""
+        if not chosen:
+            return self.all_bits
+        bits = 0
+        for v in chosen:
+            bits |= self.bits[facet].get(v, 0)
+        return bits
+
+    def select(self, chosen, base=None):
+        """Bitset of jobs matching every facet in chosen ({facet: [values]}), within base."""
+        bits = self.all_bits if base is None else base
+        for facet, values in chosen.items():
+            if values:
+                bits &= self.facet_bits(facet, values)
+        return bits
+
+    def counts(self, chosen, base=None):
+        """{facet: {value: n}}: n jobs if that value were the facet's only choice, others kept."""
+        base = self.all_bits if base is None else base
+        out = {}
+        for facet in FACETS:
+            others = self.select({f: v for f, v in chosen.items() if f != facet}, base)
+            out[facet] = {v: (others & b).bit_count() for v, b in self.bits[facet].items()}
+        return out
+
+    def selection(self, bits):
+        return Selection(bits, self.n)
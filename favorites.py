@@ -0,0 +1,176 @@
+"""
+Favorites store
+
+- keyed by (mbti, title): constant-time membership, insertion order kept
+- the table rows are appended as favorites are added, and the DataFrame
+  view is only rebuilt when the store has changed since the last call
+- optional SQLite persistence (FavoritesDB): loaded once when the store is
+  created, then written through on add/remove, never re-read per rerun;
+  favorites collected before a save ID was entered are merged into it;
+  sqlite3 and pandas are only imported once a save ID / favorite exists
+- the save ID is a bearer token: whoever has it can read that list and add
+  to it, nothing else authenticates. So IDs are never chosen by the user:
+  new_id() draws a random one (96 bits) and registers it, and only
+  registered IDs are accepted back (known())
+- nbytes() / release_table() let sessions.py account for and drop the
+  DataFrame of an idle session
+"""
+
+import os
+import secrets
+import sys
+import time
+from contextlib import contextmanager
+
+FIELDS = ("mbti", "title", "desc")
+
+
+def fav_key(entry):
+    return (entry["mbti"], entry["title"])
+
+
+class FavoritesDB:
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as con:
+            con.execute("""CREATE TABLE IF NOT EXISTS favorites (
+                user TEXT NOT NULL, mbti TEXT NOT NULL, title TEXT NOT NULL, desc TEXT,
+                added REAL NOT NULL, PRIMARY KEY (user, mbti, title))""")
+            con.execute("CREATE TABLE IF NOT EXISTS save_ids (user TEXT PRIMARY KEY, created REAL NOT NULL)")
+
+    def new_id(self):
+        """A fresh random save ID, registered so known() accepts it later."""
+        user = secrets.token_urlsafe(12)
+        with self._connect() as con:
+            con.execute("INSERT INTO save_ids VALUES (?, ?)", (user, time.time()))
+        return user
+
+    def known(self, user):
+        with self._connect() as con:
+            return con.execute("SELECT 1 FROM save_ids WHERE user = ?", (user,)).fetchone() is not None
+
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+
+        # short-lived connections: Streamlit runs each session on its own thread
+        con = sqlite3.connect(self.path, timeout=5)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def load(self, user):
+        with self._connect() as con:
+            rows = con.execute("SELECT mbti, title, desc FROM favorites WHERE user = ? ORDER BY added",
+                               (user,)).fetchall()
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def add(self, user, entry):
+        with self._connect() as con:
+            con.execute("INSERT OR IGNORE INTO favorites VALUES (?, ?, ?, ?, ?)",
+                        (user, entry["mbti"], entry["title"], entry.get("desc", ""), time.time()))
+
+    def add_many(self, user, entries):
+        # one transaction; added is nudged per entry so ORDER BY added keeps their order
+        now = time.time()
+        with self._connect() as con:
+            con.executemany("INSERT OR IGNORE INTO favorites VALUES (?, ?, ?, ?, ?)",
+                            [(user, e["mbti"], e["title"], e.get("desc", ""), now + i * 1e-6)
+                             for i, e in enumerate(entries)])
+
+    def remove(self, user, key):
+        with self._connect() as con:
+            con.execute("DELETE FROM favorites WHERE user = ? AND mbti = ? AND title = ?", (user, *key))
+
+
+class FavoritesStore:
+    def __init__(self, db=None, user=""):
+        self.db = db
+        self.user = user
+        self.version = 0
+        self._items = {}   # (mbti, title) -> entry, in insertion order
+        self._rows = []    # table rows, appended incrementally
+        self._table = None
+        self._table_key = None  # (version, labels) the DataFrame was built for
+        self._nbytes = 0
+        self._nbytes_version = 0
+        if db is not None and user:
+            for entry in db.load(user):
+                self._append(entry)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def _append(self, entry):
+        entry = {f: entry.get(f, "") for f in FIELDS}
+        self._items[fav_key(entry)] = entry
+        self._rows.append(tuple(entry[f] for f in FIELDS))
+        self.version += 1
+
+    def add(self, entry):
+        """Returns False if it was already a favorite."""
+        if fav_key(entry) in self._items:
+            return False
+        self._append(entry)
+        if self.db is not None and self.user:
+            self.db.add(self.user, entry)
+        return True
+
+    def merge(self, entries):
+        """Add entries not yet in the store (written through in one go); returns how many were new."""
+        new = []
+        for entry in entries:
+            if fav_key(entry) not in self._items:
+                self._append(entry)
+                new.append(self._items[fav_key(entry)])
+        if new and self.db is not None and self.user:
+            self.db.add_many(self.user, new)
+        return len(new)
+
+    def remove(self, key):
+        if self._items.pop(key, None) is None:
+            return False
+        self._rows = [row for row in self._rows if row[:2] != key]
+        self.version += 1
+        if self.db is not None and self.user:
+            self.db.remove(self.user, key)
+        return True
+
+    def table(self, labels=FIELDS):
+        """DataFrame of the favorites, rebuilt only after a change (or for other labels)."""
+        key = (self.version, tuple(labels))
+        if self._table_key != key:
+            import pandas as pd
+
+            self._table = pd.DataFrame(self._rows, columns=list(labels))
+            self._table_key = key
+        return self._table
+
+    def release_table(self):
+        """Drop the DataFrame; table() rebuilds it on the next call."""
+        self._table = None
+        self._table_key = None
+
+    def table_nbytes(self):
+        table = self._table
+        return int(table.memory_usage(index=True, deep=True).sum()) if table is not None else 0
+
+    def nbytes(self):
+        """Approximate bytes held: entry strings (shared by the rows) plus the DataFrame, if built."""
+        if self._nbytes_version != self.version:
+            self._nbytes = sum(sys.getsizeof(v) for row in self._rows for v in row)
+            self._nbytes_version = self.version
+        return self._nbytes + self.table_nbytes()
+
+
+def default_db_path():
+    return os.environ.get("MBTI_FAVORITES_DB",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "favorites.db"))
@@ -0,0 +1,135 @@
+"""
+Deterministic synthetic data for scale testing
+
+- generate_jobs(n, seed): job cards with the MBTI_JOBS schema (title, icon,
+  desc, majors, skills, img_q, mbti); Korean titles/descriptions composed
+  from field x role vocabularies, majors/skills drawn with a long-tail
+  (Zipf-like) distribution seeded from the built-in catalog
+- generate_colors(n, seed): entries shaped like test.py's color_data
+- same seed -> same output, so benchmarks compare like with like
+
+Usage:
+  python gen_catalog.py jobs 100000 jobs_100k.mcat      # packed catalog (catalog.py)
+  python gen_catalog.py jobs 1000 jobs_1k.json          # {"MBTI": [job, ...]} JSON
+  python gen_catalog.py colors 300 colors_300.json
+"""
+
+import json
+import random
+import sys
+from collections import Counter
+
+from catalog import MBTI_JOBS, write_json, write_packed
+
+MBTI_TYPES = list(MBTI_JOBS)
+
+# (korean field, english image query words)
+FIELDS = [
+    ("데이터", "data analytics"), ("환경", "environment nature"), ("교육", "education classroom"),
+    ("금융", "finance office"), ("의료", "hospital care"), ("콘텐츠", "content studio"),
+    ("게임", "game design"), ("로봇", "robotics lab"), ("우주항공", "aerospace"), ("식품", "food kitchen"),
+    ("패션", "fashion studio"), ("건축", "architecture"), ("물류", "logistics warehouse"),
+    ("보안", "cyber security"), ("반도체", "semiconductor"), ("바이오", "biotech lab"),
+    ("광고", "advertising creative"), ("관광", "travel tour"), ("스포츠", "sports training"),
+    ("공공정책", "government policy"), ("에너지", "energy plant"), ("모빌리티", "mobility car"),
+    ("인공지능", "ai computer"), ("음악", "music studio"), ("출판", "publishing books"),
+    ("상담", "counseling session"), ("법률", "law office"), ("부동산", "real estate"),
+    ("농업", "farm agriculture"), ("해양", "ocean marine"),
+]
+ROLES = [
+    "분석가", "디자이너", "엔지니어", "기획자", "컨설턴트", "연구원", "매니저", "상담사",
+    "코디네이터", "개발자", "전문가", "강사", "마케터", "감독", "큐레이터", "테크니션",
+]
+LEVELS = ["", "", "", "주니어 ", "시니어 ", "수석 "]  # most titles have no level
+VERBS = [
+    "문제를 정의하고 해결책을 설계하는", "현장의 요구를 파악해 서비스를 개선하는", "데이터를 바탕으로 의사결정을 돕는",
+    "사람들과 소통하며 프로젝트를 이끄는", "새로운 아이디어를 제품으로 구현하는", "품질과 안전을 책임지는",
+    "창의적인 콘텐츠를 기획·제작하는", "복잡한 시스템을 안정적으로 운영하는", "고객 경험을 설계하는",
+]
+ENDINGS = ["전문가.", "역할.", "직무.", "실무자.", "창작자.", "리더."]
+ICONS = sorted({job["icon"] for jobs in MBTI_JOBS.values() for job in jobs})
+BASE_MAJORS = sorted({m for jobs in MBTI_JOBS.values() for job in jobs for m in job["majors"]})
+BASE_SKILLS = sorted({s for jobs in MBTI_JOBS.values() for job in jobs for s in job["skills"]})
+
+
+def zipf_weights(n, s=1.1):
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def role_query(role):
+    return {"디자이너": "designer", "엔지니어": "engineer", "개발자": "developer", "연구원": "research",
+            "강사": "lecture", "감독": "director"}.get(role, "office")
+
+
+def generate_jobs(n, seed=0):
+    """Yield n job cards (each with an "mbti" key); titles are unique."""
+    rng = random.Random(seed)
+    majors = BASE_MAJORS[:]
+    skills = BASE_SKILLS[:]
+    rng.shuffle(majors)
+    rng.shuffle(skills)
+    major_w = zipf_weights(len(majors))
+    skill_w = zipf_weights(len(skills))
+    type_w = [rng.uniform(0.5, 1.5) for _ in MBTI_TYPES]  # some types are more common
+    seen = Counter()
+    for _ in range(n):
+        field, img_words = rng.choice(FIELDS)
+        role = rng.choice(ROLES)
+        title = f"{rng.choice(LEVELS)}{field} {role}"
+        seen[title] += 1
+        if seen[title] > 1:
+            title = f"{title} {seen[title]}"
+        yield {
+            "title": title,
+            "icon": rng.choice(ICONS),
+            "desc": f"{field} 분야에서 {rng.choice(VERBS)} {rng.choice(ENDINGS)}",
+            "majors": sorted(set(rng.choices(majors, major_w, k=rng.choice((1, 1, 2))))),
+            "skills": sorted(set(rng.choices(skills, skill_w, k=rng.choice((2, 2, 3))))),
+            "img_q": f"{img_words} {role_query(role)}",
+            "mbti": rng.choices(MBTI_TYPES, type_w)[0],
+        }
+
+
+COLOR_NAMES = ["빨강", "주황", "노랑", "초록", "파랑", "보라", "분홍", "청록", "갈색", "검정", "흰색", "회색",
+               "남색", "연두", "하늘", "자주", "베이지", "민트", "살구", "올리브"]
+TRAITS = ["열정적이고", "차분하고", "사교적이며", "분석적이며", "창의적이고", "신중하며", "낙천적이고", "독립적이며"]
+VALUES = ["도전을 즐깁니다.", "안정과 신뢰를 중요시합니다.", "소통과 배려를 중요시합니다.",
+          "새로운 시작을 좋아합니다.", "균형과 조화를 추구합니다.", "깊이 있는 탐구를 좋아합니다."]
+DESIGNS = ["강렬한 대비", "부드러운 톤", "미니멀 레이아웃", "자연스러운 질감", "독창적인 패턴", "밝고 경쾌한 색감"]
+LEARNING = ["행동 중심", "그룹 토론", "관찰과 실험", "계획적 집중", "자료 정리", "창의적 프로젝트"]
+CAREERS = ["리더·기획", "연구·IT", "교육·상담", "예술·디자인", "관리·회계", "서비스·관광", "환경·치유"]
+
+
+def generate_colors(n, seed=0):
+    """Return {name: {"hex", "desc", "design", "learning", "career"}} like test.py's color_data."""
+    rng = random.Random(seed)
+    colors = {}
+    for i in range(n):
+        base = COLOR_NAMES[i % len(COLOR_NAMES)]
+        name = base if i < len(COLOR_NAMES) else f"{base} {i // len(COLOR_NAMES) + 1}"
+        colors[name] = {
+            "hex": "#{:06X}".format(rng.randrange(1 << 24)),
+            "desc": f"{rng.choice(TRAITS)} {rng.choice(VALUES)}",
+            "design": f"{rng.choice(DESIGNS)} 디자인 선호",
+            "learning": f"{rng.choice(LEARNING)} 학습 선호",
+            "career": f"{rng.choice(CAREERS)} 관련 직업 적합",
+        }
+    return colors
+
+
+def main(argv):
+    if len(argv) != 4 or argv[1] not in ("jobs", "colors"):
+        sys.exit(__doc__)
+    kind, n, path = argv[1], int(argv[2]), argv[3]
+    if kind == "colors":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(generate_colors(n), f, ensure_ascii=False, indent=1)
+    elif path.endswith(".json"):
+        write_json(generate_jobs(n), path)
+    else:
+        write_packed(generate_jobs(n), path)
+    print(f"wrote {n} {kind} to {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
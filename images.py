@@ -0,0 +1,238 @@
+"""
+Card images: local assets + generated thumbnails
+
+- img_q is resolved to a local file in assets/jobs/ ("data analytics office"
+  -> assets/jobs/data-analytics-office.jpg/.jpeg/.png/.webp)
+- jobs without an asset get a generated gradient in the MBTI theme color,
+  so cards render offline and never wait on an outside image service
+- every image is cropped/downscaled once to card size and re-encoded
+  (WebP, JPEG if this Pillow build has no WebP) under a content-hash name
+- thumbnails live in a byte-bounded disk cache (static/thumbs/, oldest
+  evicted first) fronted by a byte-bounded in-memory LRU
+- Pillow is imported on first decode/encode only; serving thumbnails that
+  are already on disk never loads it
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+from cache import LRUCache
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "jobs")
+THUMB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "thumbs")
+THUMB_URL = "app/static/thumbs"  # THUMB_DIR as served by Streamlit's static serving
+ASSET_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+CARD_SIZE = (480, 320)  # a card is ~1/3 of the wide layout
+# extension -> (Pillow format, mime); the first one this Pillow build can write is used
+THUMB_FORMATS = {".webp": ("WEBP", "image/webp"), ".jpg": ("JPEG", "image/jpeg")}
+
+Thumb = namedtuple("Thumb", "digest data mime path")
+
+
+@lru_cache(maxsize=None)
+def thumb_ext():
+    from PIL import features
+
+    return ".webp" if features.check("webp") else ".jpg"
+
+
+def asset_path(img_q, asset_dir=ASSET_DIR):
+    slug = "-".join((img_q or "").lower().replace(",", " ").split())
+    for ext in ASSET_EXTS:
+        path = os.path.join(asset_dir, slug + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def hex_to_rgb(hex_color):
+    h = hex_color.lstrip("#")
+    return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def placeholder(color, size=CARD_SIZE):
+    from PIL import Image
+
+    # theme color at the top fading to near-white at the bottom
+    top = Image.new("RGB", size, hex_to_rgb(color))
+    bottom = Image.new("RGB", size, (246, 249, 252))
+    mask = Image.linear_gradient("L").resize(size)
+    return Image.composite(bottom, top, mask)
+
+
+def fit_to_card(img, size=CARD_SIZE):
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return ImageOps.fit(img, size, Image.LANCZOS)
+
+
+def encode(img, quality=80):
+    out = io.BytesIO()
+    img.save(out, THUMB_FORMATS[thumb_ext()][0], quality=quality, optimize=True)
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    def __init__(self, thumb_dir=THUMB_DIR, asset_dir=ASSET_DIR, size=CARD_SIZE,
+                 max_disk_bytes=64 << 20, max_mem_bytes=16 << 20):
+        self.thumb_dir = thumb_dir
+        self.asset_dir = asset_dir
+        self.size = size
+        self.max_disk_bytes = max_disk_bytes
+        self.mem = LRUCache(maxsize=4096, max_bytes=max_mem_bytes, sizeof=lambda t: len(t.data))
+        self._lock = threading.Lock()
+        os.makedirs(thumb_dir, exist_ok=True)
+        self._disk = {}  # path -> size, for the disk budget
+        for name in os.listdir(thumb_dir):
+            path = os.path.join(thumb_dir, name)
+            self._disk[path] = os.path.getsize(path)
+
+    def job_thumb(self, img_q, color):
+        src = asset_path(img_q, self.asset_dir)
+        if src:
+            info = os.stat(src)
+            key = ("asset", src, info.st_mtime_ns, info.st_size)
+        else:
+            key = ("placeholder", color)
+        return self.mem.get_or_compute(key, lambda: self._build(src, color))
+
+    def _build(self, src, color):
+        digest = self._digest(src, color)
+        for ext, (_, mime) in THUMB_FORMATS.items():
+            path = os.path.join(self.thumb_dir, digest + ext)
+            if os.path.isfile(path):
+                os.utime(path)  # mark as recently used for disk eviction
+                with open(path, "rb") as f:
+                    return Thumb(digest, f.read(), mime, path)
+        if src:
+            from PIL import Image
+
+            with Image.open(src) as img:
+                data = encode(fit_to_card(img, self.size))
+        else:
+            data = encode(placeholder(color, self.size))
+        path = os.path.join(self.thumb_dir, digest + thumb_ext())
+        self._store(path, data)
+        return Thumb(digest, data, THUMB_FORMATS[thumb_ext()][1], path)
+
+    def _digest(self, src, color):
+        # content hash of the source plus everything that shapes the output
+        # (the format is the file extension, so it is not part of the hash)
+        h = hashlib.sha1(f"{self.size}:".encode())
+        if src:
+            with open(src, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    h.update(chunk)
+        else:
+            h.update(f"placeholder:{color}".encode())
+        return h.hexdigest()[:16]
+
+    def _store(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk[path] = len(data)
+            if sum(self._disk.values()) > self.max_disk_bytes:
+                self._evict_disk(keep=path)
+
+    def _evict_disk(self, keep):
+        # down to 90% of the budget: files no memory entry points at go first (memory
+        # hits never bump the mtime), then least recently used (disk hits do)
+        live = {thumb.path for _, thumb in self.mem.items()} | {keep}
+        by_age = sorted(self._disk, key=lambda p: (p in live, os.path.getmtime(p) if os.path.exists(p) else 0))
+        total = sum(self._disk.values())
+        removed = set()
+        for path in by_age:
+            if total <= self.max_disk_bytes * 0.9 or path == keep:
+                break
+            total -= self._disk.pop(path)
+            removed.add(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        # a memory entry whose file is gone would keep handing out a dead static URL;
+        # dropping it makes the next use rebuild the file
+        for key, thumb in self.mem.items():
+            if thumb.path in removed:
+                self.mem.pop(key)
+
+    def stats(self):
+        return {"memory": self.mem.stats(), "disk_files": len(self._disk), "disk_bytes": sum(self._disk.values())}
+
+
+# -----------------------
+# User uploads (per session)
+# -----------------------
+def process_upload(data, size=CARD_SIZE):
+    """Decode an uploaded image once -> EXIF-rotated, card-sized, re-encoded bytes.
+
+    Returns None when the file cannot be decoded as an image.
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", (size[0] * 2, size[1] * 2))  # JPEG: decode at reduced scale
+            return encode(fit_to_card(img, size))
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def upload_id(upload):
+    return getattr(upload, "file_id", None) or (upload.name, upload.size)
+
+
+class UploadStore:
+    """Processed uploads for one session, keyed by content hash, byte-bounded."""
+
+    def __init__(self, max_bytes=2 << 20, size=CARD_SIZE):
+        self.size = size
+        self.thumbs = LRUCache(maxsize=64, max_bytes=max_bytes, sizeof=lambda t: len(t.data))
+        self._digests = {}  # upload id -> content hash, so reruns skip re-hashing
+
+    def thumb(self, upload):
+        uid = upload_id(upload)
+        digest = self._digests.get(uid)
+        if digest:
+            thumb = self.thumbs.get(digest)
+            if thumb:
+                return thumb
+        data = upload.getvalue()
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        thumb = self.thumbs.get(digest)
+        if thumb is None:
+            encoded = process_upload(data, self.size)
+            if encoded is None:
+                return None
+            thumb = Thumb(digest, encoded, THUMB_FORMATS[thumb_ext()][1], None)
+            self.thumbs.put(digest, thumb)
+        self._digests[uid] = digest
+        return thumb
+
+    def _unused(self, keep_ids):
+        keep = {self._digests.get(uid) for uid in keep_ids}
+        return [(digest, thumb) for digest, thumb in self.thumbs.items() if digest not in keep]
+
+    def unused_bytes(self, keep_ids=()):
+        """Bytes of thumbnails that no upload in keep_ids maps to."""
+        return sum(len(thumb.data) for _, thumb in self._unused(keep_ids))
+
+    def release(self, keep_ids=()):
+        """Drop thumbnails of uploads not in keep_ids; returns the bytes freed."""
+        freed = 0
+        for digest, _ in self._unused(keep_ids):
+            thumb = self.thumbs.pop(digest)
+            if thumb:
+                freed += len(thumb.data)
+        self._digests = {uid: d for uid, d in self._digests.items() if uid in keep_ids}
+        return freed
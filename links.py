@@ -0,0 +1,97 @@
+"""
+Shareable result links
+
+  ?m=INTJ&j=2s&h=7c1e0a
+- m: MBTI type, j: catalog id in base 36, h: first 6 hex digits of
+  sha1("mbti:title"); a link without j/h just opens the type
+- the hash pins a link to the job rather than to its position: when the
+  catalog has changed and id j is now another job, the job is looked up by
+  hash among the type's jobs; a link that matches nothing opens the type
+- the shared-result payload (card HTML + related jobs) is rendered once per
+  (catalog version, type, job) and kept in a process-wide LRU, so a burst
+  of visitors on one link costs a cache lookup each
+"""
+
+import hashlib
+from html import escape
+from urllib.parse import urlencode
+
+HASH_LEN = 6
+RELATED = 3
+
+
+def job_hash(mbti, title):
+    return hashlib.sha1(f"{mbti}:{title}".encode("utf-8")).hexdigest()[:HASH_LEN]
+
+
+def to_base36(n):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    while True:
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+        if not n:
+            return out
+
+
+def encode_link(mbti, job_id=None, title=None):
+    params = {"m": mbti}
+    if job_id is not None:
+        params["j"] = to_base36(job_id)
+        params["h"] = job_hash(mbti, title)
+    return params
+
+
+def share_url(base, mbti, job_id=None, title=None):
+    """base is the public app URL; empty gives a link relative to the current page."""
+    return f"{base}?{urlencode(encode_link(mbti, job_id, title))}"
+
+
+def decode_link(catalog, params):
+    """(mbti, job_id or None) for a valid link, else None."""
+    mbti = (params.get("m") or "").upper()
+    if mbti not in catalog.types:
+        return None
+    h = params.get("h") or ""
+    if len(h) != HASH_LEN:
+        return mbti, None
+    try:
+        job_id = int(params.get("j") or "", 36)
+    except ValueError:
+        job_id = -1
+    if 0 <= job_id < len(catalog):
+        card = catalog[job_id]
+        if card["mbti"] == mbti and job_hash(mbti, card["title"]) == h:
+            return mbti, job_id
+    # stale id (catalog changed): find the job by its hash
+    for i in catalog.ids_for_type(mbti):
+        if job_hash(mbti, catalog[i]["title"]) == h:
+            return mbti, i
+    return mbti, None
+
+
+def render_payload(catalog, recommender, mbti, job_id, related=RELATED):
+    """HTML for the shared card plus the ids of the closest other jobs for the type."""
+    card = catalog[job_id]
+    ranked = recommender.rank(mbti, k=related + 1)
+    others = [int(i) for i in ranked if i != job_id][:related]
+    majors = escape(", ".join(card.get("majors", [])) or "–")
+    skills = escape(", ".join(card.get("skills", [])) or "–")
+    html = f"""
+<div class="shared-card">
+  <div class="job-body">
+    <div class="job-head">
+      <div>
+        <div class="job-title">{escape(card['icon'])} {escape(card['title'])}</div>
+        <div class="job-meta">MBTI: <strong class="mbti-{mbti}">{mbti}</strong> · 적합도 {recommender.scores(mbti)[job_id]:.0%}</div>
+      </div>
+      <div style="text-align:right;">
+        <div class="job-majors-label">추천 전공</div>
+        <div class="job-majors">{majors}</div>
+      </div>
+    </div>
+    <div class="job-desc">{escape(card['desc'])}</div>
+    <div class="job-desc"><strong>핵심 역량</strong>: {skills}</div>
+  </div>
+</div>"""
+    return {"html": html, "related": others}
@@ -1,318 +1,271 @@
 # mbti_career_pro.py
 """
-MBTI Career Pro (Single-file Streamlit app)
+MBTI Career Pro (Streamlit app)
 Features:
 - 16 MBTI types with 4 curated job suggestions and descriptions each
+  (catalog.py; set MBTI_CATALOG to serve a JSON or packed catalog file
+  instead, reloaded in place when the file changes: reload.py)
 - MBTI-based color themes (auto-applied)
 - Beautiful UI: Google Fonts, responsive grid, hover effects, gradient header
-- Search & filter across all jobs
-- Image: user-uploaded image overrides or Unsplash fallback
-- Favorites (session_state), CSV download, shareable result link (simple)
+- Search & filter across all jobs (ranked, Korean-aware index in search.py)
+- Facets: major, skill, icon and MBTI letters, with live counts (facets.py)
+- Image: user-uploaded image overrides, else local asset / generated
+  thumbnail (images.py, cached on disk + in memory)
+- Favorites (per session, optional SQLite save ID), CSV download, shareable result links
+  (?m=TYPE&j=..&h=.., links.py) that open straight on the shared job
 - Job detail expanders with recommended majors/skills/steps
+- Fast grid mode: the page of cards is one HTML block from a precompiled
+  template (cards.py); only the selected card's controls are widgets
+- MBTI quiz (quiz.py) for users who don't know their type; the result
+  selects the type for the job grid
+- Usage analytics (analytics.py): selections, searches, favorites, downloads
+  and rerun times, buffered in memory and written to SQLite in the background
+- Per-session memory accounting (sessions.py): uploads, favorites and
+  exports are counted against per-session / process caps (MBTI_SESSION_MB,
+  MBTI_SESSIONS_MB), idle sessions drop what can be rebuilt, and
+  ?admin=<MBTI_ADMIN_KEY> shows the totals in the sidebar
 """
 
+import os
+import sys
+import uuid
 import streamlit as st
-from io import BytesIO
-import csv
-import pandas as pd
-from PIL import Image
-import textwrap
+from analytics import open_analytics
+from facets import AXES, FACETS, to_bits
+from favorites import FavoritesDB, FavoritesStore, default_db_path
+from export import FORMATS, available_formats, csv_bytes_from_jobs, export_bytes
+from cache import LRUCache
+from cards import CardRenderer, image_src
+from images import ThumbnailCache, UploadStore
+from links import decode_link, render_payload, share_url
+from profiling import RerunProfile, configure_logging
+from quiz import QuestionBank, QuizState
+from reload import CatalogStore
+from theme import MBTI_COLORS, app_css, stylesheet_html, theme_style
+from search import normalize, select_cards
+from sessions import open_registry
 
 st.set_page_config(page_title="MBTI Career Pro", page_icon="🎯", layout="wide")
+configure_logging()  # profile lines (mbti.profile), catalog reloads (mbti.reload)
+prof = RerunProfile("main")
 
 # -----------------------
 # Utilities
 # -----------------------
-def unsplash_url(q, w=1200, h=800):
-    q_safe = q.replace(" ", ",")
-    return f"https://source.unsplash.com/{w}x{h}/?{q_safe}"
-
-def csv_bytes_from_jobs(jobs, mbti_label=None):
-    out = BytesIO()
-    writer = csv.writer(out)
-    writer.writerow(["MBTI", "Job Title", "Short Description", "Icon", "Recommended Majors", "Key Skills"])
-    for job in jobs:
-        icon = job.get("icon","")
-        title = job["title"]
-        desc = job["desc"]
-        majors = "; ".join(job.get("majors", []))
-        skills = "; ".join(job.get("skills", []))
-        writer.writerow([mbti_label or job.get("mbti",""), title, desc, icon, majors, skills])
-    return out.getvalue()
-
-def make_share_url(mbti, job_title):
-    # simple share link placeholder (would be replaced by real domain in production)
-    base = "https://example.com/career"
-    return f"{base}?mbti={mbti}&job={st.experimental_get_query_params().get('job',[job_title])[0]}"
+# partial reruns: st.fragment (1.37+), st.experimental_fragment before that,
+# plain full reruns on older versions
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+def rerun_app():
+    # from inside a fragment: rerun the whole page so the other fragments catch up
+    if hasattr(st, "fragment"):
+        st.rerun(scope="app")
+    elif hasattr(st, "experimental_fragment"):
+        st.rerun()  # before 1.37 a rerun from a fragment is always a full one
+    # without fragments the click has already rerun the whole script
+
+@st.cache_resource
+def get_favorites_db(path):
+    return FavoritesDB(path)
+
+def favorites_store():
+    # one store per session; re-created (and loaded once from SQLite) when the save ID changes
+    user = st.session_state.get("fav_user", "").strip()
+    store = st.session_state.get("favorites")
+    if store is None or store.user != user:
+        previous = store
+        store = FavoritesStore(get_favorites_db(default_db_path()) if user else None, user)
+        if previous is not None and not previous.user and user:
+            # favorites added before the save ID was entered are kept and saved under it
+            store.merge(previous)
+        st.session_state["favorites"] = store
+        session_memory().favorites = store
+    return store
+
+@st.cache_resource
+def get_analytics():
+    return open_analytics()
+
+def track(kind, mbti=None, item=None, value=None):
+    # a ring-buffer append; the flush thread does the disk writes
+    sid = st.session_state.setdefault("sid", uuid.uuid4().hex[:12])
+    get_analytics().record(kind, "main", sid, mbti, item, value)
+
+@st.cache_resource
+def get_sessions():
+    # per-session memory accounting, caps and idle release (sessions.py)
+    return open_registry()
+
+def session_memory():
+    # kept in session_state; the registry only holds a weak reference
+    mem = st.session_state.get("memory")
+    if mem is None:
+        sid = st.session_state.setdefault("sid", uuid.uuid4().hex[:12])
+        mem = st.session_state["memory"] = get_sessions().session(sid)
+    return mem
+
+def lazy_download(label, key, signature, make_data, file_name, mime):
+    # the export is only built when "준비" is clicked, and rebuilt when signature changes;
+    # its bytes are counted in the session's memory account and dropped after the
+    # download (Streamlit keeps a downloadable file through one more rerun)
+    slot = f"export_{key}"
+    mem = session_memory()
+    data = mem.export_data(key, signature)
+    if data is None and st.button(f"{label} 준비", key=f"{slot}_prep"):
+        data = make_data()
+        if get_sessions().admit_export(mem, key, signature, data):
+            track("download", item=file_name)
+        else:
+            data = None
+            st.warning("내보내기 파일이 세션 메모리 한도를 넘습니다. 범위를 줄여 주세요.")
+    if data is not None:
+        st.download_button(label, data, file_name=file_name, mime=mime, key=f"{slot}_dl",
+                           on_click=mem.drop_export, args=(key,))
+
+def make_share_url(mbti, job_id, job_title):
+    # MBTI_PUBLIC_URL is the deployed app address; unset gives a link relative to this page
+    return share_url(os.environ.get("MBTI_PUBLIC_URL", ""), mbti, job_id, job_title)
 
 # -----------------------
 # Theme / Fonts / CSS
 # -----------------------
-MBTI_COLORS = {
-    "ISTJ": "#2B6CB0", "ISFJ": "#319795", "INFJ": "#805AD5", "INTJ": "#D69E2E",
-    "ISTP": "#1A202C", "ISFP": "#ED8936", "INFP": "#D53F8C", "INTP": "#2B6CB0",
-    "ESTP": "#DD6B20", "ESFP": "#ED64A6", "ENFP": "#38A169", "ENTP": "#4C51BF",
-    "ESTJ": "#2C7A7B", "ESFJ": "#DD6B20", "ENFJ": "#9F7AEA", "ENTJ": "#E53E3E"
-}
-
-st.markdown("""
-<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700;800&display=swap" rel="stylesheet">
-<style>
-:root{ --radius:14px; }
-html, body, [class*="css"] { font-family: 'Poppins', sans-serif; background: linear-gradient(180deg, #f6f9fc, #ffffff); }
-
-/* Header */
-.app-header {
-  padding: 28px;
-  border-radius: 16px;
-  margin-bottom: 20px;
-  display:flex;
-  align-items:center;
-  justify-content:space-between;
-  gap: 20px;
-}
-.brand {
-  display:flex; align-items:center; gap:16px;
-}
-.brand .logo {
-  width:68px; height:68px; border-radius:12px; display:flex; align-items:center; justify-content:center;
-  background: linear-gradient(135deg, rgba(255,255,255,0.1), rgba(0,0,0,0.03));
-  box-shadow: 0 6px 18px rgba(16,24,40,0.06);
-  font-weight:800; font-size:24px;
-}
-.title {
-  font-size:22px; font-weight:800; color:#111827;
-}
-.subtitle { color:#6B7280; font-size:13px; }
-
-/* Controls */
-.controls { display:flex; gap:12px; align-items:center; }
-
-/* Cards grid */
-.grid { display:grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap:20px; }
-.job-card {
-  background: #fff; border-radius: var(--radius); padding:0; overflow:hidden;
-  box-shadow: 0 8px 30px rgba(13, 38, 59, 0.06);
-  transition: transform .18s ease, box-shadow .18s ease;
-}
-.job-card:hover { transform: translateY(-6px); box-shadow: 0 14px 40px rgba(13, 38, 59, 0.10); }
-.job-media { width:100%; height:180px; object-fit:cover; display:block; }
-.job-body { padding:18px; }
-.job-head { display:flex; justify-content:space-between; align-items:flex-start; gap:12px; }
-.job-title { font-weight:700; font-size:18px; }
-.job-icon { font-size:24px; }
-.job-desc { margin-top:8px; color:#374151; font-size:14px; line-height:1.35; }
-.badge { font-size:12px; padding:6px 10px; border-radius:999px; font-weight:600; }
-
-/* footer */
-.footer { margin-top:28px; color:#9CA3AF; font-size:13px; text-align:center; padding:18px; }
-
-@media(max-width:640px){
-  .job-media { height:140px; }
-  .controls { flex-direction:column; align-items:stretch; gap:10px; }
-}
-</style>
-""", unsafe_allow_html=True)
+prof.start("setup")
+@st.cache_resource
+def get_stylesheet():
+    # compiled + minified once per process; reruns resend the cached <style> string
+    return stylesheet_html(app_css())
 
 # -----------------------
-# MBTI Data (16 types) - each has list of 4 jobs with details
-# For images we use unsplash queries; in production replace with curated assets.
+# Job catalog: built-in MBTI_JOBS, or a JSON / packed file given by
+# MBTI_CATALOG, watched and reloaded in the background. Each rerun takes one
+# snapshot (catalog + search index + recommender + facets) and uses only it.
 # -----------------------
-MBTI_JOBS = {
-    "ISTJ": [
-        {"title":"회계사", "icon":"📊", "desc":"정확성과 윤리로 재무와 세무를 관리하는 전문가.",
-         "majors":["회계학","경영학"], "skills":["엑셀·재무회계","세무지식"], "img_q":"accounting office finance"},
-        {"title":"데이터 분석가", "icon":"📈", "desc":"데이터에서 인사이트를 추출해 의사결정을 돕는 역할.",
-         "majors":["통계학","컴퓨터공학"], "skills":["SQL","통계분석"], "img_q":"data analytics office"},
-        {"title":"공무원", "icon":"🏛️", "desc":"안정적인 조직에서 공공서비스를 제공하는 직무.",
-         "majors":["행정학","법학"], "skills":["문서작성","정책이해"], "img_q":"government office building"},
-        {"title":"품질관리자", "icon":"🛠️", "desc":"제품·서비스 품질 유지와 개선을 책임지는 전문가.",
-         "majors":["산업공학","기계공학"], "skills":["QC","문제해결"], "img_q":"quality control manufacturing"}
-    ],
-    "ISFJ": [
-        {"title":"교사","icon":"📚","desc":"학생을 돌보고 가르치며 성장의 기반을 만드는 직업.",
-         "majors":["교육학"], "skills":["수업기획","소통"], "img_q":"teacher classroom"},
-        {"title":"간호사","icon":"🩺","desc":"환자 돌봄과 의료지원에서 핵심 역할을 수행.",
-         "majors":["간호학"], "skills":["환자관리","응급처치"], "img_q":"nurse hospital care"},
-        {"title":"사회복지사","icon":"🤝","desc":"복지서비스로 취약계층의 삶을 지원하는 전문가.",
-         "majors":["사회복지학"], "skills":["상담","자원연계"], "img_q":"community social work"},
-        {"title":"도서관 사서","icon":"📖","desc":"정보자원의 관리와 이용자 지원을 담당.",
-         "majors":["문헌정보학"], "skills":["자료관리","정보검색"], "img_q":"library bookshelves"}
-    ],
-    "INFJ": [
-        {"title":"상담사","icon":"🧠","desc":"개인의 내면을 이해하고 변화를 돕는 심리전문가.",
-         "majors":["심리학"], "skills":["경청·상담기술","심리평가"], "img_q":"therapy counseling"},
-        {"title":"작가","icon":"✍️","desc":"사유와 감성을 글로 풀어내는 창작자.",
-         "majors":["문예창작","국문학"], "skills":["글쓰기","관찰력"], "img_q":"writer desk creative"},
-        {"title":"심리학자","icon":"🔬","desc":"심리 연구를 통해 인간 행동을 과학적으로 탐구.",
-         "majors":["심리학"], "skills":["연구설계","통계분석"], "img_q":"psychology lab research"},
-        {"title":"예술가","icon":"🎨","desc":"감성·메시지를 이미지로 표현하는 창작자.",
-         "majors":["미술","디자인"], "skills":["크리에이티브","시각화"], "img_q":"artist studio painting"}
-    ],
-    "INTJ": [
-        {"title":"연구원","icon":"🔍","desc":"전문 분야의 문제를 풀고 지식을 확장하는 역할.",
-         "majors":["전공특화"], "skills":["논리적사고","실험설계"], "img_q":"scientist lab research"},
-        {"title":"전략기획가","icon":"📋","desc":"조직의 장기 목표와 실행계획을 설계.",
-         "majors":["경영학","경제학"], "skills":["전략수립","데이터해석"], "img_q":"strategy planning"},
-        {"title":"프로그래머","icon":"💻","desc":"시스템/서비스를 설계·구현하여 문제를 해결.",
-         "majors":["컴퓨터공학"], "skills":["코딩","시스템설계"], "img_q":"programmer coding laptop"},
-        {"title":"변호사","icon":"⚖️","desc":"법적 문제 해결과 권리 보호를 담당.",
-         "majors":["법학"], "skills":["논리·글쓰기","법리해석"], "img_q":"lawyer books courtroom"}
-    ],
-    "ISTP": [
-        {"title":"엔지니어","icon":"⚙️","desc":"현실 문제를 기술적으로 해결하는 실무전문가.",
-         "majors":["기계·전기·전자"], "skills":["기술분석","현장해결"], "img_q":"engineer workshop tools"},
-        {"title":"경찰관","icon":"🚓","desc":"공공안전과 질서유지를 책임지는 직업.",
-         "majors":["경찰행정"], "skills":["신속대응","위기관리"], "img_q":"police patrol"},
-        {"title":"항공 정비사","icon":"✈️","desc":"항공기의 안전운항을 위해 정비·점검 수행.",
-         "majors":["항공정비"], "skills":["정비기술","세심함"], "img_q":"aircraft maintenance hangar"},
-        {"title":"사진작가","icon":"📷","desc":"시각을 통해 순간을 예술화하는 창작자.",
-         "majors":["사진예술"], "skills":["구도·디자인","촬영기술"], "img_q":"photographer camera portrait"}
-    ],
-    "ISFP": [
-        {"title":"디자이너","icon":"🎨","desc":"공간·시각을 아름답게 설계하는 창작자.",
-         "majors":["디자인"], "skills":["색채·레이아웃","창의력"], "img_q":"designer studio workspace"},
-        {"title":"작곡가","icon":"🎼","desc":"음악으로 감정을 구성하고 전달하는 전문가.",
-         "majors":["음악"], "skills":["작곡·편곡","음악이론"], "img_q":"composer studio music"},
-        {"title":"요리사","icon":"👨‍🍳","desc":"미각과 미감을 결합해 음식을 창조.",
-         "majors":["조리학"], "skills":["조리기술","프레젠테이션"], "img_q":"chef kitchen plating"},
-        {"title":"치유사","icon":"🌿","desc":"몸과 마음의 회복을 돕는 치료적 역할.",
-         "majors":["대체의학"], "skills":["공감·케어","테라피기법"], "img_q":"healing therapy wellness"}
-    ],
-    "INFP": [
-        {"title":"소설가","icon":"📖","desc":"내면의 상상과 메시지를 글로 구현하는 작가.",
-         "majors":["문예창작"], "skills":["창의적서사","문장력"], "img_q":"novelist writing desk"},
-        {"title":"상담가","icon":"🧠","desc":"정서적 지원과 변화의 촉진을 돕는 역할.",
-         "majors":["심리학"], "skills":["경청·공감","상담기법"], "img_q":"counseling session"},
-        {"title":"예술가","icon":"🎭","desc":"감정과 아이디어를 예술작업으로 표현.",
-         "majors":["미술·연극"], "skills":["표현력","창작"], "img_q":"artist gallery creative"},
-        {"title":"환경운동가","icon":"🌏","desc":"지구와 사회를 위한 실천과 캠페인을 이끎.",
-         "majors":["환경학"], "skills":["조직화","캠페인기획"], "img_q":"environment activism nature"}
-    ],
-    "INTP": [
-        {"title":"개발자","icon":"💻","desc":"논리적 문제를 코드로 해결하고 제품을 완성.",
-         "majors":["컴퓨터공학"], "skills":["알고리즘·코딩","시스템디자인"], "img_q":"developer coding laptop"},
-        {"title":"과학자","icon":"🔬","desc":"자연·현상을 분석하고 지식을 확장.",
-         "majors":["자연과학"], "skills":["실험·자료해석","논문작성"], "img_q":"science laboratory research"},
-        {"title":"발명가","icon":"💡","desc":"새로운 아이디어를 제품·서비스로 구현.",
-         "majors":["융합공학"], "skills":["문제발견","프로토타이핑"], "img_q":"invention prototype workshop"},
-        {"title":"교수","icon":"🎓","desc":"연구와 교육을 통해 지식을 전파.",
-         "majors":["전공심화"], "skills":["연구·강의","논리정리"], "img_q":"university lecture hall"}
-    ],
-    "ESTP": [
-        {"title":"기업가","icon":"🏢","desc":"실행력으로 기회를 포착해 사업을 성장시킴.",
-         "majors":["경영학"], "skills":["리스크테이킹","영업"], "img_q":"entrepreneur startup office"},
-        {"title":"영업사원","icon":"💼","desc":"현장에서 고객 가치를 만들고 성과를 창출.",
-         "majors":["경영·마케팅"], "skills":["소통·협상","영업전략"], "img_q":"sales meeting handshake"},
-        {"title":"스포츠 코치","icon":"🏅","desc":"선수의 기량을 끌어올리고 전략을 설계.",
-         "majors":["체육"], "skills":["훈련설계","동기부여"], "img_q":"sports coach training"},
-        {"title":"파일럿","icon":"🛫","desc":"항공 운항과 승객 안전을 책임지는 전문조종사.",
-         "majors":["항공운항"], "skills":["조종술·응급대응","공간지각"], "img_q":"pilot cockpit flying"}
-    ],
-    "ESFP": [
-        {"title":"배우","icon":"🎬","desc":"연기와 표현으로 관객과 감정을 나누는 직업.",
-         "majors":["연기·무대"], "skills":["연기·표현","대중소통"], "img_q":"actor stage performance"},
-        {"title":"이벤트 기획자","icon":"🎉","desc":"크고 작은 행사를 창의적으로 실행.",
-         "majors":["문화기획"], "skills":["프로젝트관리","현장운영"], "img_q":"event planning stage"},
-        {"title":"여행 가이드","icon":"🗺️","desc":"현장에서 경험을 전달하고 여행을 완성.",
-         "majors":["관광·문화"], "skills":["설명·안내","문제대응"], "img_q":"tour guide travel"},
-        {"title":"스타일리스트","icon":"👗","desc":"이미지와 패션을 통해 사람을 연출.",
-         "majors":["패션"], "skills":["스타일링","트렌드분석"], "img_q":"stylist fashion studio"}
-    ],
-    "ENFP": [
-        {"title":"마케터","icon":"📢","desc":"창의적 스토리로 브랜드와 고객을 연결.",
-         "majors":["마케팅"], "skills":["콘텐츠기획","브랜딩"], "img_q":"marketing creative team"},
-        {"title":"창업가","icon":"🚀","desc":"아이디어를 현실로 만들고 조직을 성장.",
-         "majors":["경영"], "skills":["기획·리더십","제품개발"], "img_q":"startup team brainstorming"},
-        {"title":"방송인","icon":"🎙️","desc":"대중과 소통하며 영향력을 만드는 직업.",
-         "majors":["미디어"], "skills":["발화력","콘텐츠제작"], "img_q":"podcast studio broadcast"},
-        {"title":"광고 기획자","icon":"🖌️","desc":"광고 캠페인으로 메시지를 창작·전달.",
-         "majors":["광고·마케팅"], "skills":["콘셉트구성","카피라이팅"], "img_q":"advertising creative concept"}
-    ],
-    "ENTP": [
-        {"title":"컨설턴트","icon":"💼","desc":"문제의 본질을 찾아 해결책을 제시.",
-         "majors":["경영·전공"], "skills":["분석·프레젠테이션","전략"], "img_q":"consulting meeting"},
-        {"title":"벤처사업가","icon":"🏢","desc":"혁신적 사업으로 시장을 도전·개척.",
-         "majors":["경영"], "skills":["네트워킹","제품시장적합성"], "img_q":"venture startup office"},
-        {"title":"정치가","icon":"🏛️","desc":"정책과 공공 이슈를 만들어가는 리더.",
-         "majors":["정치외교"], "skills":["협상·연설","정책이해"], "img_q":"politics debate podium"},
-        {"title":"프로듀서","icon":"🎬","desc":"콘텐츠의 기획·제작을 총괄하는 역할.",
-         "majors":["미디어·예술"], "skills":["프로젝트관리","콘텐츠기획"], "img_q":"producer studio production"}
-    ],
-    "ESTJ": [
-        {"title":"관리자","icon":"📊","desc":"조직운영과 성과관리를 책임지는 리더.",
-         "majors":["경영"], "skills":["운영관리","리더십"], "img_q":"office manager meeting"},
-        {"title":"군인","icon":"🪖","desc":"안보와 규율을 바탕으로 국가를 수호.",
-         "majors":["군사학"], "skills":["규율·체력","팀워크"], "img_q":"soldier uniform training"},
-        {"title":"영업 관리자","icon":"📈","desc":"영업팀을 관리하며 목표를 달성.",
-         "majors":["경영·마케팅"], "skills":["성과관리","전략적영업"], "img_q":"sales manager office"},
-        {"title":"프로젝트 매니저","icon":"📋","desc":"프로젝트 기획·실행·종료를 총괄.",
-         "majors":["경영·IT"], "skills":["PM기술","리스크관리"], "img_q":"project manager planning"}
-    ],
-    "ESFJ": [
-        {"title":"간호사","icon":"🩺","desc":"환자 돌봄과 의료지원의 출발점에서 활약.",
-         "majors":["간호학"], "skills":["환자케어","팀워크"], "img_q":"nurse caring patient"},
-        {"title":"교사","icon":"📚","desc":"학생의 성장을 돕는 교육현장의 핵심.",
-         "majors":["교육학"], "skills":["수업설계","소통"], "img_q":"teacher school classroom"},
-        {"title":"HR 담당자","icon":"👥","desc":"조직문화와 인재관리를 담당.",
-         "majors":["경영·심리"], "skills":["채용·평가","커뮤니케이션"], "img_q":"hr recruitment office"},
-        {"title":"이벤트 플래너","icon":"🎉","desc":"사람을 중심으로 행사를 기획·운영.",
-         "majors":["문화기획"], "skills":["조직관리","현장운영"], "img_q":"event planner stage"}
-    ],
-    "ENFJ": [
-        {"title":"리더십 코치","icon":"🎯","desc":"팀과 개인의 성장과 협업을 돕는 전문가.",
-         "majors":["심리·교육"], "skills":["코칭","조직개발"], "img_q":"leadership coaching"},
-        {"title":"방송인","icon":"🎙️","desc":"메시지를 전달하고 공감을 만드는 역할.",
-         "majors":["미디어"], "skills":["화술","콘텐츠제작"], "img_q":"broadcaster studio"},
-        {"title":"강사","icon":"📝","desc":"주제 전문성을 교육으로 전달하는 직업.",
-         "majors":["전공심화"], "skills":["교육설계","전달력"], "img_q":"teacher lecture classroom"},
-        {"title":"외교관","icon":"🌐","desc":"국가 간 협상을 통해 관계를 설계.",
-         "majors":["국제관계"], "skills":["언어·협상","국제정책"], "img_q":"diplomat meeting"}
-    ],
-    "ENTJ": [
-        {"title":"경영자","icon":"🏢","desc":"조직의 비전과 전술을 결정하는 최고책임자.",
-         "majors":["경영"], "skills":["전략수립","리더십"], "img_q":"ceo office meeting"},
-        {"title":"변호사","icon":"⚖️","desc":"법률 문제의 해결과 권리 보호를 담당.",
-         "majors":["법학"], "skills":["논리·소송","문서작성"], "img_q":"law firm courtroom"},
-        {"title":"CEO","icon":"💼","desc":"기업 전체 운영과 성과에 책임을 지는 역할.",
-         "majors":["경영"], "skills":["의사결정","조직운영"], "img_q":"business leader office"},
-        {"title":"전략 컨설턴트","icon":"📊","desc":"기업의 핵심 문제를 진단하고 해법 제시.",
-         "majors":["경영·경제"], "skills":["분석·전략수립","프레젠테이션"], "img_q":"strategy consultant meeting"}
-    ]
-}
+@st.cache_resource
+def get_catalog_store(path):
+    return CatalogStore(path)
+
+catalog_store = get_catalog_store(os.environ.get("MBTI_CATALOG"))
+snapshot = catalog_store.current()
+catalog = snapshot.catalog
+
+# -----------------------
+# Deep link: decoded once per session, before the sidebar is built, so the
+# MBTI select already starts on the shared type
+# -----------------------
+if "deep_link" not in st.session_state:
+    st.session_state["deep_link"] = decode_link(catalog, st.query_params)
+    st.session_state["deep_link_for"] = catalog.version
+    if st.session_state["deep_link"]:
+        link_mbti, link_id = st.session_state["deep_link"]
+        st.session_state["mbti_select"] = link_mbti
+        track("share_open", link_mbti, catalog[link_id]["title"] if link_id is not None else None)
+elif st.session_state["deep_link"] and st.session_state.get("deep_link_for") != catalog.version:
+    # ids may have moved in a reload: resolve the link again by its hash
+    st.session_state["deep_link"] = decode_link(catalog, st.query_params)
+    st.session_state["deep_link_for"] = catalog.version
+shared_link = st.session_state["deep_link"]
+# a finished quiz hands its type over here, before the select exists
+if "quiz_mbti" in st.session_state:
+    st.session_state["mbti_select"] = st.session_state.pop("quiz_mbti")
 
 # -----------------------
 # Sidebar controls: MBTI select, search, upload images, theme override
 # -----------------------
+prof.start("sidebar")
 st.sidebar.markdown("## 🔧 설정")
-selected_mbti = st.sidebar.selectbox("MBTI 선택", list(MBTI_JOBS.keys()), index=0)
+selected_mbti = st.sidebar.selectbox("MBTI 선택", list(catalog.types), index=0, key="mbti_select")
 
 search = st.sidebar.text_input("🔎 키워드 검색 (직업명 · 설명 · 스킬)", "")
 only_show_selected = st.sidebar.checkbox("선택 MBTI만 보기", value=True)
+page_size = st.sidebar.selectbox("페이지당 카드 수", [6, 12, 24, 48], index=1)
+facet_box = st.sidebar.container()  # filled once the counts are known (see filter)
 
 st.sidebar.markdown("---")
 st.sidebar.write("직업 카드에 사용할 이미지를 업로드하면 해당 직업 카드에서 우선 사용됩니다.")
 uploaded_images = {}
-# allow uploading images for each job of selected mbti:
-for job in MBTI_JOBS[selected_mbti]:
-    key = f"upload_{selected_mbti}_{job['title']}"
-    uploaded = st.sidebar.file_uploader(f"'{job['title']}' 이미지 업로드", type=["png","jpg","jpeg"], key=key)
-    if uploaded:
-        uploaded_images[job['title']] = uploaded
+# uploads are decoded/downscaled once and kept per session up to a byte quota
+if "upload_store" not in st.session_state:
+    st.session_state["upload_store"] = UploadStore(max_bytes=int(os.environ.get("MBTI_UPLOAD_QUOTA_KB", "2048")) << 10)
+upload_store = st.session_state["upload_store"]
+# memory account of this session: per-run figures restart here, idle sessions are swept
+mem = session_memory()
+mem.upload_store = upload_store
+mem.begin()
+get_sessions().touch(mem)
+# one uploader for the job picked here (one uploader per job made the sidebar
+# grow with the catalog); uploads are kept in session state per (type, title)
+job_uploads = st.session_state.setdefault("job_uploads", {})
+
+def keep_upload(job_key, widget_key):
+    # on_change: a new file replaces the job's image, clearing the uploader removes it
+    uploaded = st.session_state.get(widget_key)
+    if uploaded is None:
+        job_uploads.pop(job_key, None)
+    else:
+        job_uploads[job_key] = uploaded
+
+upload_title = st.sidebar.selectbox("이미지를 바꿀 직업", [job["title"] for job in catalog.by_type(selected_mbti)],
+                                    key=f"upload_job_{selected_mbti}")
+if upload_title is not None:
+    job_key = (selected_mbti, upload_title)
+    widget_key = f"upload_{selected_mbti}_{upload_title}"
+    st.sidebar.file_uploader(f"'{upload_title}' 이미지 업로드", type=["png","jpg","jpeg"], key=widget_key,
+                             on_change=keep_upload, args=(job_key, widget_key))
+    if job_key in job_uploads and st.session_state.get(widget_key) is None:
+        st.sidebar.caption(f"사용 중인 이미지: {job_uploads[job_key].name}")
+        st.sidebar.button("🗑 이미지 제거", key="upload_remove", on_click=job_uploads.pop, args=(job_key, None))
+for job_key, uploaded in list(job_uploads.items()):
+    # checked against the session cap once; the decision sticks while the upload is kept
+    if get_sessions().admit_upload(mem, uploaded):
+        uploaded_images[job_key] = uploaded
+    else:
+        del job_uploads[job_key]
+        st.sidebar.warning(f"'{job_key[1]}' 이미지는 세션 메모리 한도를 넘어 사용하지 않습니다. "
+                           "다른 이미지를 지운 뒤 다시 올려 주세요.")
+mem.end_uploads()
 
 st.sidebar.markdown("---")
+theme_override = None
 if st.sidebar.checkbox("테마 색 직접 설정", value=False):
-    c = st.sidebar.color_picker("테마 색상 선택", MBTI_COLORS[selected_mbti])
-    MBTI_COLORS[selected_mbti] = c
+    theme_override = st.sidebar.color_picker("테마 색상 선택", MBTI_COLORS[selected_mbti])
+# the save ID is a bearer token (favorites.py): generated here, never typed in freely
+def new_save_id():
+    st.session_state["fav_user"] = get_favorites_db(default_db_path()).new_id()
+
+def restore_save_id():
+    entered = st.session_state.get("fav_restore", "").strip()
+    if entered and get_favorites_db(default_db_path()).known(entered):
+        st.session_state["fav_user"] = entered
+        st.session_state["fav_restore"] = ""
+    elif entered:
+        st.session_state["fav_restore_error"] = True
+
+if st.session_state.get("fav_user"):
+    st.sidebar.caption("⭐ 즐겨찾기 저장 ID: 다음 방문에 입력하면 목록이 복원됩니다. "
+                       "이 ID를 아는 사람은 누구나 목록을 보고 추가할 수 있으니 비밀번호처럼 보관하세요.")
+    st.sidebar.code(st.session_state["fav_user"], language=None)
+else:
+    st.sidebar.button("⭐ 즐겨찾기 저장 ID 만들기", key="fav_new_id", on_click=new_save_id,
+                      help="임의의 ID를 만들어 즐겨찾기를 이 기기에 저장합니다.")
+    st.sidebar.text_input("저장 ID로 복원", key="fav_restore", type="password", on_change=restore_save_id)
+    if st.session_state.pop("fav_restore_error", False):
+        st.sidebar.warning("등록되지 않은 저장 ID입니다.")
+fast_grid = st.sidebar.checkbox("⚡ 빠른 그리드 (카드를 한 블록으로 렌더링)", value=True)
+show_debug = st.sidebar.checkbox("🐞 디버그 패널", value=False)
 
 # -----------------------
 # Header
 # -----------------------
-theme = MBTI_COLORS[selected_mbti]
-st.markdown(f"""
-<div class="app-header" style="background: linear-gradient(90deg, {theme}33, #ffffff); border:1px solid {theme}22;">
+prof.start("header")
+# the cached stylesheet has the static rules; the selected (or custom) theme color comes per rerun
+if theme_override:
+    theme_css = theme_style(theme_override, selected_mbti)
+else:
+    theme_css = theme_style(MBTI_COLORS[selected_mbti])
+st.markdown(f"""{get_stylesheet()}{theme_css}
+<div class="app-header">
   <div class="brand">
-    <div class="logo" style="background: linear-gradient(135deg, {theme}, #ffffff33); color:#fff;">MC</div>
+    <div class="logo">MC</div>
     <div>
       <div class="title">MBTI Career Pro</div>
       <div class="subtitle">MBTI 기반 맞춤형 진로 추천 · 탐색 · 저장</div>
@@ -320,8 +273,8 @@ st.markdown(f"""
   </div>
   <div class="controls">
     <div style="display:flex; gap:10px; align-items:center;">
-      <div class="badge" style="background:{theme}22; color:{theme}; border:1px solid {theme}33;">선택: {selected_mbti}</div>
-      <div class="badge" style="background:#fff; color:#374151; border:1px solid #E5E7EB;">총 유형: 16</div>
+      <div class="badge badge-theme">선택: {selected_mbti}</div>
+      <div class="badge badge-plain">총 유형: 16</div>
     </div>
   </div>
 </div>
@@ -337,136 +290,381 @@ with right:
     st.write(" ")
     st.write(" ")
     if st.button("모두 초기화"):
-        st.experimental_set_query_params()
-        # clear sidebar uploads can't be programmatically cleared; user can replace
+        st.query_params.clear()
+        st.session_state["deep_link"] = shared_link = None
+        for facet in FACETS:
+            st.session_state.pop(f"facet_{facet}", None)
+        job_uploads.clear()  # the next rerun stops using (and counting) them
 
 # -----------------------
-# Build job list to show
+# MBTI quiz: one question per step; answers update the score vector in
+# place and only this fragment reruns until the result is applied
 # -----------------------
-all_cards = []
-for mbti_type, jobs in MBTI_JOBS.items():
-    for job in jobs:
-        item = job.copy()
-        item["mbti"] = mbti_type
-        # image preference: if user uploaded for selected MBTI, we map after selection for display
-        item["img_q"] = job.get("img_q", job["title"])
-        all_cards.append(item)
-
-# Apply search & filter
-display_cards = []
-q_lower = (q or "").strip().lower()
-for item in all_cards:
-    # filter by MBTI selection if requested
-    if only_show_selected and item["mbti"] != selected_mbti:
-        continue
-    if q_lower:
-        hay = " ".join([item["title"], item["desc"], " ".join(item.get("skills", [])), " ".join(item.get("majors", []))]).lower()
-        if q_lower in hay:
-            display_cards.append(item)
+@st.cache_resource
+def get_question_bank():
+    return QuestionBank()
+
+@fragment
+def quiz_panel():
+    quiz = st.session_state.get("quiz")
+    if quiz is None:
+        quiz = st.session_state["quiz"] = QuizState(get_question_bank())
+    bank = quiz.bank
+    if quiz.step < len(bank):
+        q = quiz.step
+        st.progress(q / len(bank), text=f"{q + 1} / {len(bank)}")
+        st.markdown(f"**{bank.questions[q]}**")
+        qcols = st.columns(min(3, len(bank.choices[q])))
+        for c, label in enumerate(bank.choices[q]):
+            with qcols[c % len(qcols)]:
+                st.button(label, key=f"quiz_{q}_{c}", use_container_width=True, on_click=quiz.answer, args=(q, c))
     else:
-        display_cards.append(item)
+        result = quiz.mbti()
+        st.markdown(f"#### 결과: <span class='mbti-{result}'>{result}</span>", unsafe_allow_html=True)
+        st.table([{"축": f"{axis[0]} / {axis[1]}", axis[0]: f"{share:.0%}", axis[1]: f"{1 - share:.0%}"}
+                  for axis, share in quiz.leanings()])
+        if st.button(f"🎯 {result} 직업 보기", key="quiz_apply"):
+            st.session_state["quiz_mbti"] = result
+            track("quiz", result)
+            st.rerun()
+    # callbacks run before the rerun, so the next question shows right away;
+    # going back keeps the old answer, which answer() swaps out when it changes
+    bcol1, bcol2 = st.columns(2)
+    with bcol1:
+        if quiz.step > 0:
+            st.button("← 이전 질문", key="quiz_back", on_click=quiz.back)
+    with bcol2:
+        if quiz.answers:
+            st.button("처음부터", key="quiz_reset", on_click=st.session_state.pop, args=("quiz", None))
 
-# Sort: show selected MBTI's items first
-display_cards.sort(key=lambda x: (0 if x["mbti"]==selected_mbti else 1, x["title"]))
+with st.expander("🧩 내 MBTI를 모르겠다면: 퀴즈로 찾기"):
+    quiz_panel()
+
+# -----------------------
+# Build job list to show
+# -----------------------
+prof.start("filter")
+# derived structures come with the snapshot: doc ids are catalog positions
+index = snapshot.index
+recommender = snapshot.recommender  # 16 x N MBTI/job affinity matrix
+facet_index = snapshot.facets       # one bitset per facet value
+all_cards = catalog
+
+def card_list_nbytes(value):
+    # id tuples: a pointer plus an int object (32 bytes allocated) per id; facet counts: one dict per facet
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + 32 * len(value)
+    return sys.getsizeof(value) + sum(sys.getsizeof(counts) for counts in value.values())
+
+@st.cache_resource
+def get_card_list_cache():
+    # process-wide memo of filtered + sorted card ids, shared by all sessions;
+    # one entry can hold every id of a large catalog, so it is byte-bounded too
+    return LRUCache(maxsize=512, max_bytes=int(os.environ.get("MBTI_LIST_CACHE_MB", "64")) << 20,
+                    sizeof=card_list_nbytes)
+
+# Apply search & filter (memoized on everything the result depends on)
+card_list_cache = get_card_list_cache()
+q_norm = normalize(q)
+if st.session_state.get("tracked") != (selected_mbti, q_norm):
+    last_mbti, last_q = st.session_state.get("tracked") or (None, "")
+    if selected_mbti != last_mbti:
+        track("select", selected_mbti)
+    if q_norm and q_norm != last_q:
+        track("search", selected_mbti, q_norm)
+    st.session_state["tracked"] = (selected_mbti, q_norm)
+
+# Facets: choices come from the previous interaction (widget state), the
+# counts are for the current query / type restriction
+def facet_choice(facet):
+    value = st.session_state.get(f"facet_{facet}")
+    if facet in AXES:
+        return [value] if value else []
+    return value or []
+
+chosen = {facet: facet_choice(facet) for facet in FACETS}
+chosen_key = tuple((facet, tuple(sorted(v))) for facet, v in chosen.items() if v)
+
+def facet_base():
+    bits = facet_index.all_bits
+    if q_norm:
+        bits &= to_bits([i for i, _ in index.search(q_norm)], len(catalog))
+    if only_show_selected:
+        bits &= facet_index.type_bits[selected_mbti]
+    return bits
+
+facet_counts = card_list_cache.get_or_compute(
+    ("facet_counts", catalog.version, selected_mbti, only_show_selected, q_norm, chosen_key),
+    lambda: facet_index.counts(chosen, facet_base()))
+
+# option labels stay fixed (a widget's id depends on them, and a new id would
+# drop the choice), so the live counts go into captions
+def count_caption(facet, values):
+    return " · ".join(f"{v} {facet_counts[facet][v]}" for v in values)
+
+with facet_box.expander("🧮 상세 필터", expanded=bool(chosen_key)):
+    for axis in AXES:
+        st.radio(f"{axis[0]} / {axis[1]}", ["", axis[0], axis[1]], key=f"facet_{axis}", horizontal=True,
+                 format_func=lambda v: v or "전체")
+        st.caption(count_caption(axis, axis))
+    for facet, label in (("major", "전공"), ("skill", "스킬"), ("icon", "분류 아이콘")):
+        st.multiselect(label, facet_index.values(facet), key=f"facet_{facet}")
+        top = sorted(facet_counts[facet], key=lambda v: -facet_counts[facet][v])[:5]
+        st.caption(count_caption(facet, chosen[facet] + [v for v in top if v not in chosen[facet]]))
+
+allowed = facet_index.selection(facet_index.select(chosen)) if chosen_key else None
+list_key = (catalog.version, selected_mbti, only_show_selected, q_norm, chosen_key)
+display_ids = card_list_cache.get_or_compute(
+    list_key, lambda: select_cards(catalog, index, selected_mbti, only_show_selected, q_norm, recommender,
+                                   allowed=allowed))
+affinity = recommender.scores(selected_mbti)
 
 # -----------------------
 # Render grid of cards
 # -----------------------
+prof.start("grid")
+@fragment
+def card_actions(card_id, item):
+    # details + favorite / share / download for one card; a click here reruns
+    # only this fragment, not the whole grid
+    st.markdown(f"**권장 전공 / 교육 경로**: {', '.join(item.get('majors', ['관련 전공 다양']))}")
+    st.markdown(f"**핵심 역량(스킬)**: {', '.join(item.get('skills', ['커뮤니케이션 등']))}")
+    steps = [
+        f"1) 관련 기본 과목 수강: {', '.join(item.get('majors', ['기본과목']))}",
+        "2) 실무 경험(인턴/프로젝트) 쌓기",
+        "3) 포트폴리오 및 관련 자격증 준비",
+        "4) 진로 관련 네트워킹 및 멘토링"
+    ]
+    st.markdown("<br>".join(steps), unsafe_allow_html=True)
+    # favorite button
+    fav_key = f"fav_{item['mbti']}_{item['title']}"
+    if st.button("⭐ 즐겨찾기 추가", key=fav_key):
+        entry = {"mbti":item["mbti"], "title":item["title"], "desc":item["desc"]}
+        if favorites_store().add(entry):
+            track("favorite", item["mbti"], item["title"])
+            # the favorites panel is its own fragment: rerun the page so it lists the new one,
+            # and show the confirmation on the rerun
+            st.session_state["fav_added"] = fav_key
+            rerun_app()
+        else:
+            st.warning("이미 즐겨찾기에 있습니다.")
+    if st.session_state.get("fav_added") == fav_key:
+        del st.session_state["fav_added"]
+        st.success("즐겨찾기에 추가되었습니다.")
+    # share + download
+    col1, col2 = st.columns([1,1])
+    with col1:
+        share_link = make_share_url(item["mbti"], card_id, item["title"])
+        st.markdown(f"[🔗 공유 링크 생성]({share_link})", unsafe_allow_html=True)
+    with col2:
+        csv_bytes = csv_bytes_from_jobs([item], item["mbti"])
+        session_memory().card_csv[card_id] = len(csv_bytes)
+        if st.download_button("📥 이 직업 CSV 저장", csv_bytes, file_name=f"{item['title']}.csv", mime="text/csv", key=f"dl_{item['mbti']}_{item['title']}"):
+            track("download", item["mbti"], item["title"])
+
+@st.cache_resource
+def get_thumbnails():
+    return ThumbnailCache(max_disk_bytes=int(os.environ.get("MBTI_THUMB_CACHE_MB", "64")) << 20)
+
+thumbs = get_thumbnails()
+
+@st.cache_resource
+def get_link_pages():
+    # rendered shared-result payloads, shared by every session opening a link
+    return LRUCache(maxsize=1024)
+
+# a shared job is pinned above the results while its type is selected
+if shared_link and shared_link[1] is not None and shared_link[0] == selected_mbti:
+    shared_mbti, shared_id = shared_link
+    payload = get_link_pages().get_or_compute(
+        (catalog.version, shared_mbti, shared_id),
+        lambda: render_payload(catalog, recommender, shared_mbti, shared_id))
+    st.markdown("### 🔗 공유된 결과")
+    st.markdown(payload["html"], unsafe_allow_html=True)
+    if payload["related"]:
+        st.caption("함께 보면 좋은 직업: " + " · ".join(
+            f"{all_cards[i]['icon']} {all_cards[i]['title']}" for i in payload["related"]))
+
 st.markdown("### 🔎 결과")
+# only the visible page is materialized; the page resets when the list changes
+n_pages = max(1, -(-len(display_ids) // page_size))
+if st.session_state.get("page_for") != (list_key, page_size):
+    st.session_state["page_for"] = (list_key, page_size)
+    st.session_state["page"] = 1
+if n_pages > 1:
+    pcol, pinfo = st.columns([1,3])
+    with pcol:
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key="page")
+else:
+    page = 1
+start = (page - 1) * page_size
+display_cards = [all_cards[i] for i in display_ids[start:start + page_size]]
+if n_pages > 1:
+    with pinfo:
+        st.write(" ")
+        st.caption(f"총 {len(display_ids)}개 중 {start + 1}–{start + len(display_cards)} · {page}/{n_pages} 페이지")
+
+@st.cache_resource
+def get_card_renderer():
+    return CardRenderer()
+
+def card_thumb(item):
+    # processed upload else local thumbnail; None + warning if unreadable
+    if (item["mbti"], item["title"]) in uploaded_images:
+        thumb = upload_store.thumb(uploaded_images[item["mbti"], item["title"]])
+        if thumb is not None:
+            return thumb
+        st.warning(f"'{item['title']}' 업로드 이미지를 읽을 수 없습니다.")
+    return thumbs.job_thumb(item["img_q"], MBTI_COLORS[item["mbti"]])
+
 if not display_cards:
     st.info("검색 결과가 없습니다. 키워드를 바꿔보세요.")
+elif fast_grid:
+    from streamlit import config
+
+    # static part of the page: one element; controls: one card at a time
+    renderer = get_card_renderer()
+    static_thumbs = config.get_option("server.enableStaticServing")
+    page_items = list(zip(display_ids[start:start + page_size], display_cards))
+    cards_html = []
+    for card_id, item in page_items:
+        with prof.card(f"{item['mbti']} {item['title']}"):
+            cards_html.append(renderer.card(catalog.version, card_id, item,
+                                            image_src(card_thumb(item), static_thumbs), affinity[card_id],
+                                            make_share_url(item["mbti"], card_id, item["title"])))
+    st.markdown(renderer.grid(cards_html), unsafe_allow_html=True)
+    st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
+    picked = st.selectbox("자세히 보기 · 즐겨찾기 · 다운로드", [card_id for card_id, _ in page_items],
+                          format_func=lambda i: f"{all_cards[i]['icon']} {all_cards[i]['title']} ({all_cards[i]['mbti']})",
+                          key="picked_card")
+    with st.container(border=True):
+        card_actions(picked, all_cards[picked])
 else:
     cols_per_row = 3
     # responsive grid via CSS grid; but we will use Streamlit columns loop
-    rows = [display_cards[i:i+cols_per_row] for i in range(0, len(display_cards), cols_per_row)]
+    page_items = list(zip(display_ids[start:start + page_size], display_cards))
+    rows = [page_items[i:i+cols_per_row] for i in range(0, len(page_items), cols_per_row)]
     for row in rows:
         cols = st.columns(cols_per_row)
-        for col, item in zip(cols, row):
-            with col:
-                # choose image: uploaded (only for selected_mbti) else unsplash fallback
-                img_obj = None
-                if item["mbti"] == selected_mbti and item["title"] in uploaded_images:
-                    img_obj = uploaded_images[item["title"]]
-                # Display image
-                if img_obj:
-                    try:
-                        st.image(img_obj, use_column_width=True)
-                    except:
-                        st.image(Image.open(img_obj), use_column_width=True)
-                else:
-                    url = unsplash_url(f"{item['img_q']},{item['title']}")
-                    st.image(url, use_column_width=True)
+        for col, (card_id, item) in zip(cols, row):
+            with col, prof.card(f"{item['mbti']} {item['title']}"):
+                st.image(card_thumb(item).data, use_column_width=True)
                 # card body
                 st.markdown(f"""
                     <div class="job-body">
                       <div class="job-head">
                         <div>
                           <div class="job-title">{item['icon']} {item['title']}</div>
-                          <div style="font-size:12px; color:#6B7280; margin-top:6px;">MBTI: <strong style="color:{MBTI_COLORS[item['mbti']]};">{item['mbti']}</strong></div>
+                          <div class="job-meta">MBTI: <strong class="mbti-{item['mbti']}">{item['mbti']}</strong> · 적합도 {affinity[card_id]:.0%}</div>
                         </div>
                         <div style="text-align:right;">
-                          <div style="font-size:12px; color:#9CA3AF;">추천 전공</div>
-                          <div style="font-weight:600; margin-top:6px;">{', '.join(item.get('majors', ['–']))}</div>
+                          <div class="job-majors-label">추천 전공</div>
+                          <div class="job-majors">{', '.join(item.get('majors', ['–']))}</div>
                         </div>
                       </div>
                       <div class="job-desc">{item['desc']}</div>
                     </div>
                 """, unsafe_allow_html=True)
 
-                # expand for details + action buttons
-                key = f"exp_{item['mbti']}_{item['title']}"
+                # expand for details + action buttons (partial rerun on click)
                 with st.expander("자세히 보기 · 활동/스킬/진로 경로"):
-                    st.markdown(f"**권장 전공 / 교육 경로**: {', '.join(item.get('majors', ['관련 전공 다양']))}")
-                    st.markdown(f"**핵심 역량(스킬)**: {', '.join(item.get('skills', ['커뮤니케이션 등']))}")
-                    steps = [
-                        f"1) 관련 기본 과목 수강: {', '.join(item.get('majors', ['기본과목']))}",
-                        "2) 실무 경험(인턴/프로젝트) 쌓기",
-                        "3) 포트폴리오 및 관련 자격증 준비",
-                        "4) 진로 관련 네트워킹 및 멘토링"
-                    ]
-                    st.markdown("<br>".join(steps), unsafe_allow_html=True)
-                    # favorite button
-                    fav_key = f"fav_{item['mbti']}_{item['title']}"
-                    if st.button("⭐ 즐겨찾기 추가", key=fav_key):
-                        if "favorites" not in st.session_state:
-                            st.session_state["favorites"] = []
-                        entry = {"mbti":item["mbti"], "title":item["title"], "desc":item["desc"]}
-                        if entry not in st.session_state["favorites"]:
-                            st.session_state["favorites"].append(entry)
-                            st.success("즐겨찾기에 추가되었습니다.")
-                        else:
-                            st.warning("이미 즐겨찾기에 있습니다.")
-                    # share + download
-                    col1, col2 = st.columns([1,1])
-                    with col1:
-                        share_link = make_share_url(item["mbti"], item["title"])
-                        st.markdown(f"[🔗 공유 링크 생성]({share_link})", unsafe_allow_html=True)
-                    with col2:
-                        csv_bytes = csv_bytes_from_jobs([item], item["mbti"])
-                        st.download_button("📥 이 직업 CSV 저장", csv_bytes, file_name=f"{item['title']}.csv", mime="text/csv")
+                    card_actions(card_id, item)
                 st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
 
+# -----------------------
+# Export: current results or the whole catalog, streamed to a temp file
+# -----------------------
+prof.start("export")
+st.markdown("### 📦 내보내기")
+ecol1, ecol2, ecol3 = st.columns([2,1,2])
+with ecol1:
+    export_scope = st.radio("범위", ["현재 결과", "전체 카탈로그"], horizontal=True)
+with ecol2:
+    export_fmt = st.selectbox("형식", available_formats(), format_func=lambda f: FORMATS[f][0])
+with ecol3:
+    st.write(" ")
+    fmt_label, fmt_ext, fmt_mime = FORMATS[export_fmt][:3]
+    if export_scope == "현재 결과":
+        export_jobs = lambda: (all_cards[i] for i in display_ids)
+        export_name = f"mbti_results.{fmt_ext}"
+    else:
+        export_jobs = lambda: iter(catalog)
+        export_name = f"mbti_catalog.{fmt_ext}"
+    lazy_download(f"📦 {fmt_label} 다운로드", "results", (export_scope, export_fmt, list_key),
+                  lambda: export_bytes(export_jobs(), export_fmt), export_name, fmt_mime)
+
 # -----------------------
 # Favorites panel & CSV export for favorites
 # -----------------------
+prof.start("favorites")
 st.markdown("---")
-st.markdown("### 📌 내 즐겨찾기")
-if "favorites" in st.session_state and st.session_state["favorites"]:
-    favs = st.session_state["favorites"]
-    df = pd.DataFrame(favs)
-    st.dataframe(df.rename(columns={"mbti":"MBTI","title":"직업","desc":"설명"}), use_container_width=True)
-    csv_all = csv_bytes_from_jobs([{"title":f['title'],"desc":f['desc'],"icon":""} for f in favs], mbti_label="favorite")
-    st.download_button("🔽 즐겨찾기 전체 CSV 다운로드", csv_all, file_name="favorites.csv", mime="text/csv")
-else:
-    st.info("즐겨찾기한 직업이 없습니다. 관심 있는 직업을 찾아 추가해보세요!")
+
+@fragment
+def favorites_panel():
+    # reruns on its own; adding a favorite from a card reruns the whole page, so the
+    # new one shows right away (refresh picks up anything else)
+    hcol, rcol = st.columns([4,1])
+    with hcol:
+        st.markdown("### 📌 내 즐겨찾기")
+    with rcol:
+        st.button("🔄 새로고침", key="fav_refresh")
+    favs = favorites_store()
+    if len(favs):
+        st.dataframe(favs.table(labels=("MBTI", "직업", "설명")), use_container_width=True)
+        lazy_download("🔽 즐겨찾기 전체 CSV 다운로드", "favorites", (favs.user, favs.version),
+                      lambda: export_bytes(iter(favs), "csv", mbti_label="favorite"), "favorites.csv", "text/csv")
+    else:
+        st.info("즐겨찾기한 직업이 없습니다. 관심 있는 직업을 찾아 추가해보세요!")
+
+favorites_panel()
 
 # -----------------------
 # Footer
 # -----------------------
+prof.start("footer")
 st.markdown(f"""
 <div class="footer">
   MBTI Career Pro · Demo · 디자인/데이터는 샘플입니다. <br>
-  이미지: Unsplash (자동 검색) · 프로덕션에서는 자체 자산 사용 권장 · © 2025
+  이미지: 로컬 에셋(assets/jobs) · 없으면 테마 색 썸네일 자동 생성 · © 2025
 </div>
 """, unsafe_allow_html=True)
 
+# -----------------------
+# Render profile (one log line per rerun; optional debug panel)
+# -----------------------
+prof.finish()
+track("rerun", selected_mbti, value=prof.total_ms)
+if show_debug:
+    summary = prof.summary()
+    with st.sidebar.expander("🐞 렌더링 프로파일", expanded=True):
+        st.caption(f"총 {summary['total_ms']}ms · 요소 {summary['elements']}개 · "
+                   f"{summary['bytes'] / 1024:.1f}KB (HTML {summary['html_bytes'] / 1024:.1f}KB)")
+        st.table([{"구간": name, **s} for name, s in summary["sections"].items()])
+        st.caption(f"카드 {summary['cards']}개 · 평균 {summary['card_ms_mean']}ms · 최대 {summary['card_ms_max']}ms")
+        st.table([{"카드": label, "ms": round(ms, 2)} for label, ms in prof.slowest_cards()])
+        st.json({"card_list_cache": card_list_cache.stats(), "thumbnails": thumbs.stats(),
+                 "link_pages": get_link_pages().stats(), "analytics": get_analytics().stats(),
+                 "catalog": catalog_store.stats(), "card_fields": get_card_renderer().stats()})
+
+# -----------------------
+# Admin: memory held by sessions (open the app with ?admin=<MBTI_ADMIN_KEY>)
+# -----------------------
+admin_key = os.environ.get("MBTI_ADMIN_KEY")
+if admin_key and st.query_params.get("admin") == admin_key:
+    mem_stats = get_sessions().stats()
+    def mb(n):
+        return f"{n / (1 << 20):.1f}MB"
+    with st.sidebar.expander("🛡️ 관리자 · 세션 메모리", expanded=True):
+        st.caption(f"세션 {mem_stats['sessions']}개 (활성 {mem_stats['active']}) · 합계 {mb(mem_stats['total'])} / "
+                   f"한도 {mb(mem_stats['global_cap'])} · 세션당 한도 {mb(mem_stats['session_cap'])}")
+        st.table([{"항목": kind, "크기": mb(n)} for kind, n in mem_stats["bytes"].items()])
+        rel = mem_stats["releases"]
+        # released: dropped from the account; freed: of that, memory the app itself let go
+        st.caption(f"해제 {mb(mem_stats['released_bytes'])} · 반환 {mb(mem_stats['freed_bytes'])} "
+                   f"(유휴 {rel['idle']} · 세션 한도 {rel['session_cap']} · "
+                   f"전체 한도 {rel['global_cap']}회) · 거부 {mem_stats['refused']}건")
+        st.table([{"세션": r["sid"], "유휴(초)": r["idle_s"], "업로드": mb(r["uploads"]),
+                   "즐겨찾기": mb(r["favorites"]), "내보내기": mb(r["exports"]), "합계": mb(r["total"])}
+                  for r in mem_stats["top"]])
+        if st.button("유휴 세션 정리", key="admin_sweep"):
+            get_sessions().sweep(exclude=session_memory())
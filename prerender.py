@@ -0,0 +1,237 @@
+"""
+Static prerender of the read-only result pages
+
+The 16 MBTI pages (main.py with a type selected, no search / filters) and
+the color result pages (test.py) are the same for every visitor, so they
+are rendered once to plain files:
+
+  site/index.html            type tiles + color tiles
+  site/mbti/<TYPE>.html      jobs of the type (best fit first) + related jobs
+  site/colors/index.html     color tiles
+  site/colors/<i>.html       result card of color i on its background
+  site/css/site.<hash>.css   one minified stylesheet for every page
+  site/img/<digest>.<ext>    card thumbnails (images.py, local assets or
+                             generated theme-color gradients)
+
+- pages reuse the app's pieces: the catalog and ranking (catalog.py,
+  recommend.py), the card template (cards.py), the color engine
+  (colors.py) and the stylesheets (theme.py), so they look like the app
+- the .stApp:has(.theme-XXXX) / .color-bg-i selectors work as in the app:
+  every page body is wrapped in a .stApp element holding the marker
+- a file is only rewritten when its content changed, and files from the
+  previous build that are no longer produced are removed (manifest.json),
+  so re-running after a catalog edit touches only what moved
+- share links on the cards point at the live app (MBTI_PUBLIC_URL) when it
+  is set; the Streamlit app is then only needed for search, filters,
+  favorites and the quiz
+
+Usage:
+  python prerender.py [site] [--catalog jobs.mcat] [--colors colors.json] [--per-type 60]
+  python -m http.server -d site
+"""
+
+import argparse
+import json
+import os
+from html import escape
+from string import Template
+
+from cards import CardRenderer
+from catalog import load_catalog
+from colors import ColorTest, default_colors_path, load_colors
+from images import ThumbnailCache
+from links import share_url
+from recommend import MBTI_TYPES, Recommender
+from theme import MBTI_COLORS, SITE_CSS, main_css, minify, publish
+
+PER_TYPE = 60  # jobs on a type page, best fit first (the full list stays in the app)
+RELATED = 6    # best-fit jobs of other types under the type's own jobs
+
+PAGE = Template("""<!doctype html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title</title>
+<link rel="stylesheet" href="$css">
+</head>
+<body>
+<div class="stApp">
+<div class="$marker"></div>
+<div class="site">
+<nav class="site-nav">$nav</nav>
+$body
+</div>
+</div>
+</body>
+</html>""")
+
+HEADER = Template("""<div class="app-header">
+<div class="brand">
+<div class="logo">MC</div>
+<div>
+<div class="title">MBTI Career Pro</div>
+<div class="subtitle">MBTI 기반 맞춤형 진로 추천 · 탐색 · 저장</div>
+</div>
+</div>
+<div class="controls">
+<div class="badge badge-theme">$badge</div>
+<div class="badge badge-plain">총 유형: 16</div>
+</div>
+</div>""")
+
+
+class SiteWriter:
+    """Writes files under out_dir, skipping unchanged ones; remembers what this build produced."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.files = set()
+        self.written = 0
+        self.unchanged = 0
+
+    def write(self, rel, text):
+        self.files.add(rel)
+        path = os.path.join(self.out_dir, rel)
+        data = text.encode("utf-8")
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    self.unchanged += 1
+                    return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.written += 1
+
+    def prune(self, previous):
+        """Remove files of the previous build that this build did not produce."""
+        removed = 0
+        for rel in previous:
+            path = os.path.join(self.out_dir, rel)
+            if rel not in self.files and os.path.isfile(path):
+                os.remove(path)
+                removed += 1
+        return removed
+
+
+def page(title, css, marker, nav, body):
+    return minify(PAGE.substitute(title=escape(title), css=css, marker=marker, nav=nav, body=body))
+
+
+def nav_html(prefix, public_url):
+    links = [f'<a href="{prefix}index.html">🏠 전체 유형</a>', f'<a href="{prefix}colors/index.html">🎨 색채 심리 테스트</a>']
+    if public_url:
+        links.append(f'<a href="{escape(public_url)}">🔎 검색 · 즐겨찾기 (인터랙티브)</a>')
+    return " · ".join(links)
+
+
+def type_tiles(prefix):
+    return '<div class="tiles">' + "".join(
+        f'<a class="tile mbti-{t}" href="{prefix}mbti/{t}.html">{t}</a>' for t in MBTI_TYPES) + "</div>"
+
+
+def color_tiles(color_test, prefix):
+    return '<div class="tiles">' + "".join(
+        f'<a class="tile" style="background:{color_test.colors[name]["hex"]}; color:{color_test.fg[name]};" '
+        f'href="{prefix}{i}.html">{escape(name)}</a>' for i, name in enumerate(color_test.names)) + "</div>"
+
+
+def build(out_dir, catalog_path=None, colors_path=None, per_type=PER_TYPE, public_url=""):
+    catalog = load_catalog(catalog_path)
+    recommender = Recommender(catalog)
+    color_test = ColorTest(load_colors(colors_path))
+    renderer = CardRenderer()
+    thumbs = ThumbnailCache(thumb_dir=os.path.join(out_dir, "img"), max_disk_bytes=1 << 40)
+    site = SiteWriter(out_dir)
+
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    previous = []
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f).get("files", [])
+
+    # one stylesheet for every page; its hashed name changes only when the CSS does
+    css_url = publish("site", "\n".join([main_css(), color_test.css(), SITE_CSS]),
+                      css_dir=os.path.join(out_dir, "css"), url="css")
+    site.files.add(css_url)
+    images = set()
+
+    def card_html(card_id, fit):
+        card = catalog[card_id]
+        thumb = thumbs.job_thumb(card["img_q"], MBTI_COLORS[card["mbti"]])
+        images.add(os.path.basename(thumb.path))
+        # without a live app the link goes to the job's type page
+        share = (share_url(public_url, card["mbti"], card_id, card["title"]) if public_url
+                 else f"{card['mbti']}.html")
+        return renderer.card(catalog.version, card_id, card, f"../img/{os.path.basename(thumb.path)}", fit, share)
+
+    # -----------------------
+    # MBTI pages
+    # -----------------------
+    for t in MBTI_TYPES:
+        affinity = recommender.scores(t)
+        own = recommender.rank(t, catalog.ids_for_type(t))
+        body = [HEADER.substitute(badge=f"선택: {t}")]
+        body.append(f"<h2>{t} 추천 직업 ({min(len(own), per_type)} / {len(own)})</h2>")
+        if len(own):
+            body.append(renderer.grid(card_html(int(i), affinity[i]) for i in own[:per_type]))
+        else:
+            body.append("<p>등록된 직업이 없습니다.</p>")
+        related = [int(i) for i in recommender.rank(t, k=RELATED + per_type) if catalog[int(i)]["mbti"] != t]
+        if related:
+            body.append("<h2>다른 유형에서도 잘 맞는 직업</h2>")
+            body.append(renderer.grid(card_html(i, affinity[i]) for i in related[:RELATED]))
+        site.write(f"mbti/{t}.html", page(f"{t} · MBTI Career Pro", f"../{css_url}", f"theme-{t}",
+                                          nav_html("../", public_url), "\n".join(body)))
+
+    # -----------------------
+    # Color pages
+    # -----------------------
+    site.write("colors/index.html", page(
+        "🎨 색채 심리 테스트", f"../{css_url}", "", nav_html("../", public_url),
+        "<h1>🎨 나의 색채 심리 테스트</h1>\n<h3>좋아하는 색을 선택하세요:</h3>\n" + color_tiles(color_test, "")))
+    for i, name in enumerate(color_test.names):
+        site.write(f"colors/{i}.html", page(
+            f"{name} · 색채 심리 테스트", f"../{css_url}", f"color-bg-{i}", nav_html("../", public_url),
+            color_tiles(color_test, "") + color_test.result_html(name)))
+
+    # -----------------------
+    # Index
+    # -----------------------
+    site.write("index.html", page(
+        "MBTI Career Pro", css_url, "", nav_html("", public_url),
+        "\n".join([HEADER.substitute(badge="전체 유형"), "<h2>MBTI 유형별 추천 직업</h2>", type_tiles(""),
+                   "<h2>🎨 색채 심리 테스트</h2>", color_tiles(color_test, "colors/")])))
+
+    site.files.update(f"img/{name}" for name in images)
+    site.files.add("manifest.json")
+    # thumbnails no page references any more (e.g. an edited asset) go too
+    stale_images = [f"img/{name}" for name in os.listdir(os.path.join(out_dir, "img")) if name not in images]
+    removed = site.prune(set(previous) | set(stale_images))
+    site.write("manifest.json", json.dumps(
+        {"catalog": catalog.version, "files": sorted(site.files)}, ensure_ascii=False, indent=1))
+    return {"pages": len(MBTI_TYPES) + len(color_test) + 2, "images": len(images),
+            "written": site.written, "unchanged": site.unchanged, "removed": removed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prerender the MBTI / color result pages to static HTML")
+    parser.add_argument("out_dir", nargs="?", default="site")
+    parser.add_argument("--catalog", default=os.environ.get("MBTI_CATALOG"),
+                        help="packed or JSON catalog (default: MBTI_CATALOG, else the built-in jobs)")
+    parser.add_argument("--colors", default=default_colors_path(),
+                        help="color JSON (default: MBTI_COLOR_DATA, else the built-in colors)")
+    parser.add_argument("--per-type", type=int, default=PER_TYPE, help=f"jobs per type page (default {PER_TYPE})")
+    parser.add_argument("--public-url", default=os.environ.get("MBTI_PUBLIC_URL", ""),
+                        help="address of the live app for share links (default: MBTI_PUBLIC_URL)")
+    args = parser.parse_args(argv)
+    stats = build(args.out_dir, args.catalog, args.colors, args.per_type, args.public_url)
+    print(f"{stats['pages']} pages, {stats['images']} images in {args.out_dir}: "
+          f"{stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+
+
+if __name__ == "__main__":
+    main()
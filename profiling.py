@@ -0,0 +1,133 @@
+"""
+Per-rerun render profiling
+
+- start(name) closes the previous section and opens the next one, so the
+  app is timed top to bottom without re-indenting its blocks
+- card(label) times one card inside the grid section
+- while a profile is active, every message Streamlit sends to the browser
+  is counted (elements, bytes, bytes of markdown/HTML) and charged to the
+  current section; this hooks the script run context, so it degrades to
+  timing only if that internal API is not available
+- finish() logs one JSON line per rerun on the "mbti.profile" logger;
+  configure_logging() gives the app's "mbti.*" loggers a stderr handler
+  (MBTI_LOG_LEVEL, default INFO; WARNING drops the per-rerun lines)
+"""
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+log = logging.getLogger("mbti.profile")
+
+
+def configure_logging(level=None):
+    # nothing configures logging for app code under `streamlit run` (only the
+    # "streamlit" logger gets a handler), so INFO lines would be dropped
+    logger = logging.getLogger("mbti")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+        logger.setLevel((level or os.environ.get("MBTI_LOG_LEVEL", "INFO")).upper())
+    return logger
+
+
+def _script_ctx():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx()
+
+
+class RerunProfile:
+    def __init__(self, app="main"):
+        self.app = app
+        self.t0 = time.perf_counter()
+        self.sections = OrderedDict()  # name -> {"ms", "elements", "bytes", "html_bytes"}
+        self.cards = []                # (label, ms)
+        self.total_ms = None
+        self._current = None
+        self._section_t0 = self.t0
+        self._ctx = _script_ctx()
+        self._hook()
+
+    # -- message counting --
+    def _hook(self):
+        ctx = self._ctx
+        if ctx is None or not hasattr(ctx, "_enqueue"):
+            return
+        # a run that raised never reached finish(); drop its stale wrapper
+        enqueue = getattr(ctx._enqueue, "__wrapped__", ctx._enqueue)
+
+        def counting_enqueue(msg):
+            self._count(msg)
+            enqueue(msg)
+
+        counting_enqueue.__wrapped__ = enqueue
+        ctx._enqueue = counting_enqueue
+
+    def _unhook(self):
+        ctx = self._ctx
+        if ctx is not None and hasattr(getattr(ctx, "_enqueue", None), "__wrapped__"):
+            ctx._enqueue = ctx._enqueue.__wrapped__
+
+    def _count(self, msg):
+        if self._current is None or msg.WhichOneof("type") != "delta":
+            return
+        stats = self.sections[self._current]
+        stats["elements"] += 1
+        stats["bytes"] += msg.ByteSize()
+        element = msg.delta.new_element
+        if msg.delta.WhichOneof("type") == "new_element" and element.WhichOneof("type") == "markdown":
+            stats["html_bytes"] += len(element.markdown.body.encode("utf-8"))
+
+    # -- timing --
+    def start(self, name):
+        now = time.perf_counter()
+        self._close(now)
+        self._current = name
+        self._section_t0 = now
+        self.sections.setdefault(name, {"ms": 0.0, "elements": 0, "bytes": 0, "html_bytes": 0})
+
+    def _close(self, now):
+        if self._current is not None:
+            self.sections[self._current]["ms"] += (now - self._section_t0) * 1000
+
+    @contextmanager
+    def card(self, label):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.cards.append((label, (time.perf_counter() - t) * 1000))
+
+    def finish(self):
+        now = time.perf_counter()
+        self._close(now)
+        self._current = None
+        self._unhook()
+        self.total_ms = (now - self.t0) * 1000
+        log.info(json.dumps(self.summary(), ensure_ascii=False))
+        return self
+
+    def summary(self):
+        card_ms = [ms for _, ms in self.cards]
+        return {
+            "app": self.app,
+            "total_ms": round(self.total_ms or 0.0, 2),
+            "elements": sum(s["elements"] for s in self.sections.values()),
+            "bytes": sum(s["bytes"] for s in self.sections.values()),
+            "html_bytes": sum(s["html_bytes"] for s in self.sections.values()),
+            "sections": {name: dict(s, ms=round(s["ms"], 2)) for name, s in self.sections.items()},
+            "cards": len(card_ms),
+            "card_ms_max": round(max(card_ms), 2) if card_ms else 0.0,
+            "card_ms_mean": round(sum(card_ms) / len(card_ms), 2) if card_ms else 0.0,
+        }
+
+    def slowest_cards(self, n=5):
+        return sorted(self.cards, key=lambda c: -c[1])[:n]
@@ -0,0 +1,108 @@
+"""
+MBTI quiz (color choices + situational questions)
+
+- each choice carries a 4-axis weight vector (E/I, S/N, T/F, J/P; positive
+  leans to the first letter), precomputed into tuples when the bank loads
+- a session's QuizState keeps the running sum of the chosen vectors; an
+  answer adds its vector and a changed answer first subtracts the old one,
+  so each step is O(axes) no matter how long the quiz is
+- the type is the sign of each axis (ties go to TIE_BREAK)
+"""
+
+from recommend import AXES
+
+TIE_BREAK = "ISFP"  # per-axis letter when the score is exactly 0
+
+# (question, [(choice label, {letter: weight}), ...])
+QUESTIONS = [
+    ("가장 끌리는 색은?", [
+        ("🔴 빨강", {"E": 1, "T": 0.5}), ("🟡 노랑", {"E": 1, "N": 0.5}),
+        ("🔵 파랑", {"I": 1, "T": 0.5}), ("🟢 초록", {"I": 0.5, "F": 1}),
+        ("🟣 보라", {"N": 1, "F": 0.5}), ("⚫ 검정", {"I": 0.5, "J": 1}),
+    ]),
+    ("주말에 에너지를 채우는 방법은?", [
+        ("친구들과 약속을 잡는다", {"E": 2}), ("혼자 조용히 쉰다", {"I": 2}),
+        ("상황에 따라 다르다", {"E": 0.5, "P": 0.5}),
+    ]),
+    ("새 프로젝트를 시작할 때 먼저 하는 일은?", [
+        ("구체적인 사실과 자료를 모은다", {"S": 2}), ("큰 그림과 가능성을 떠올린다", {"N": 2}),
+        ("일정표부터 만든다", {"J": 1.5, "S": 0.5}),
+    ]),
+    ("친구가 고민을 털어놓으면?", [
+        ("해결책을 함께 찾는다", {"T": 2}), ("먼저 마음을 공감해 준다", {"F": 2}),
+    ]),
+    ("여행 스타일은?", [
+        ("일정을 꼼꼼히 계획한다", {"J": 2}), ("발길 닿는 대로 다닌다", {"P": 2}),
+        ("큰 틀만 정하고 즉흥적으로", {"P": 1, "N": 0.5}),
+    ]),
+    ("방을 꾸민다면 어떤 색 조합을?", [
+        ("🟠 주황 · 분홍 포인트", {"E": 1, "F": 1}), ("⚪ 흰색 · 회색 미니멀", {"I": 0.5, "T": 0.5, "J": 1}),
+        ("🟤 갈색 · 초록 내추럴", {"S": 1, "F": 0.5}), ("🩵 청록 · 보라 감각적", {"N": 1.5, "P": 0.5}),
+    ]),
+    ("회의에서 나는 주로?", [
+        ("먼저 의견을 말한다", {"E": 2}), ("충분히 듣고 정리해서 말한다", {"I": 2}),
+    ]),
+    ("설명서를 읽을 때 나는?", [
+        ("순서대로 따라 한다", {"S": 2, "J": 0.5}), ("대충 보고 직접 해 본다", {"N": 1, "P": 1}),
+    ]),
+    ("결정을 내릴 때 더 중요한 것은?", [
+        ("논리와 일관성", {"T": 2}), ("사람들의 마음과 관계", {"F": 2}),
+    ]),
+    ("마감이 다가오면?", [
+        ("이미 끝내 두었다", {"J": 2}), ("마감 직전에 몰입한다", {"P": 2}),
+    ]),
+]
+
+
+def axis_vector(weights):
+    """{letter: weight} -> 4-tuple, first letter of each axis positive."""
+    vec = [0.0] * len(AXES)
+    for letter, w in weights.items():
+        for i, axis in enumerate(AXES):
+            if letter == axis[0]:
+                vec[i] += w
+            elif letter == axis[1]:
+                vec[i] -= w
+    return tuple(vec)
+
+
+class QuestionBank:
+    def __init__(self, questions=QUESTIONS):
+        self.questions = [text for text, _ in questions]
+        self.choices = [[label for label, _ in choices] for _, choices in questions]
+        self.vectors = [[axis_vector(w) for _, w in choices] for _, choices in questions]
+        # largest possible |score| per axis, for the percentage bars
+        self.max_abs = [sum(max(abs(v[i]) for v in vecs) for vecs in self.vectors) or 1.0
+                        for i in range(len(AXES))]
+
+    def __len__(self):
+        return len(self.questions)
+
+
+class QuizState:
+    def __init__(self, bank):
+        self.bank = bank
+        self.scores = [0.0] * len(AXES)
+        self.answers = {}  # question index -> choice index
+        self.step = 0
+
+    def answer(self, q, choice):
+        old = self.answers.get(q)
+        if old is not None:
+            for i, v in enumerate(self.bank.vectors[q][old]):
+                self.scores[i] -= v
+        for i, v in enumerate(self.bank.vectors[q][choice]):
+            self.scores[i] += v
+        self.answers[q] = choice
+        self.step = min(q + 1, len(self.bank))
+
+    def back(self):
+        self.step = max(0, self.step - 1)
+
+    def mbti(self):
+        return "".join(axis[0] if s > 0 else axis[1] if s < 0 else TIE_BREAK[i]
+                       for i, (axis, s) in enumerate(zip(AXES, self.scores)))
+
+    def leanings(self):
+        """[(axis, first-letter share 0..1), ...] for display."""
+        return [(axis, 0.5 + s / (2 * m)) for axis, s, m in zip(AXES, self.scores, self.bank.max_abs)]
@@ -0,0 +1,98 @@
+"""
+MBTI x job affinity (NumPy)
+
+- each MBTI type is a 4-axis vector (E/I, S/N, T/F, J/P as +1/-1); each job
+  takes the vector of the type it is listed under
+- each job also has a bag of skills + majors; a type's profile is the
+  normalized sum of the bags of its jobs
+- affinity[type, job] = TYPE_WEIGHT * axis similarity (0..1)
+                      + FEATURE_WEIGHT * cosine(type profile, job bag)
+  is precomputed once for all 16 types over the whole catalog
+  (16 x N float32), so ranking is one gather + argsort/argpartition
+"""
+
+from itertools import product
+
+import numpy as np
+
+AXES = ("EI", "SN", "TF", "JP")
+MBTI_TYPES = tuple("".join(p) for p in product(*AXES))
+TYPE_INDEX = {t: i for i, t in enumerate(MBTI_TYPES)}
+TYPE_WEIGHT = 0.6
+FEATURE_WEIGHT = 0.4
+QUERY_WEIGHT = 0.5  # how much a (normalized) search score adds on top of affinity
+
+
+def type_vector(mbti):
+    mbti = (mbti or "").upper()
+    if len(mbti) != 4:
+        return np.zeros(4, dtype=np.float32)
+    return np.array([1.0 if mbti[i] == axis[0] else -1.0 if mbti[i] == axis[1] else 0.0
+                     for i, axis in enumerate(AXES)], dtype=np.float32)
+
+
+class Recommender:
+    def __init__(self, catalog):
+        n = len(catalog)
+        feature_ids = {}
+        job_types = np.zeros((n, 4), dtype=np.float32)
+        job_of, feat_of = [], []   # sparse (job, feature) pairs
+        for j, card in enumerate(catalog):
+            job_types[j] = type_vector(card["mbti"])
+            for f in set(card.get("skills", [])) | set(card.get("majors", [])):
+                job_of.append(j)
+                feat_of.append(feature_ids.setdefault(f, len(feature_ids)))
+        job_of = np.array(job_of, dtype=np.int64)
+        feat_of = np.array(feat_of, dtype=np.int64)
+
+        # job bags are binary, L2-normalized
+        nnz = np.bincount(job_of, minlength=n).astype(np.float32)
+        weight = 1.0 / np.sqrt(np.maximum(nnz, 1))[job_of]
+
+        # type profiles: sum of the bags of each type's jobs, L2-normalized
+        type_of_job = np.array([TYPE_INDEX.get(card["mbti"], -1) for card in catalog], dtype=np.int64)
+        profiles = np.zeros((len(MBTI_TYPES), len(feature_ids)), dtype=np.float32)
+        listed = type_of_job[job_of] >= 0
+        np.add.at(profiles, (type_of_job[job_of][listed], feat_of[listed]), weight[listed])
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        profiles /= np.maximum(norms, 1e-9)
+
+        # feature cosine for every (type, job): sum over each job's features
+        contrib = profiles[:, feat_of] * weight  # (16, nnz)
+        feature_sim = np.stack([np.bincount(job_of, weights=row, minlength=n) for row in contrib])
+
+        types = np.stack([type_vector(t) for t in MBTI_TYPES])
+        axis_sim = (types @ job_types.T / 4.0 + 1.0) / 2.0  # (16, n) in 0..1
+
+        self.affinity = (TYPE_WEIGHT * axis_sim + FEATURE_WEIGHT * feature_sim).astype(np.float32)
+
+    def __len__(self):
+        return self.affinity.shape[1]
+
+    def scores(self, mbti, ids=None):
+        row = self.affinity[TYPE_INDEX[mbti]]
+        return row if ids is None else row[np.asarray(ids, dtype=np.int64)]
+
+    def rank(self, mbti, ids=None, query_scores=None, k=None):
+        """Catalog ids best first; ids limits the candidates, query_scores {id: score} boosts them."""
+        ids = np.arange(len(self)) if ids is None else np.asarray(ids, dtype=np.int64)
+        if ids.size == 0:
+            return ids
+        score = self.scores(mbti, ids).copy()
+        if query_scores:
+            q = np.array([query_scores.get(int(i), 0) for i in ids], dtype=np.float32)
+            score += QUERY_WEIGHT * q / max(q.max(), 1e-9)
+        if k is not None and k < ids.size:
+            top = np.argpartition(-score, k)[:k]
+            return ids[top[np.argsort(-score[top], kind="stable")]]
+        return ids[np.argsort(-score, kind="stable")]
+
+    def top_k_batch(self, mbtis, k, candidates=None):
+        """Top-k ids for many types at once -> (len(mbtis), k) array."""
+        rows = self.affinity[[TYPE_INDEX[t] for t in mbtis]]
+        ids = np.arange(len(self)) if candidates is None else np.asarray(candidates, dtype=np.int64)
+        rows = rows[:, ids]
+        k = min(k, ids.size)
+        top = np.argpartition(-rows, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(rows, top, axis=1).argsort(axis=1)[:, ::-1]
+        return ids[np.take_along_axis(top, order, axis=1)]
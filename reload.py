@@ -0,0 +1,182 @@
+"""
+Catalog hot reload
+
+- CatalogStore serves an immutable Snapshot (catalog, search index,
+  recommender, facets); a rerun takes one snapshot at its start and uses
+  it throughout, so a reload never shows it half-applied data
+- a daemon thread polls the catalog file (mtime + size); on a change the
+  next snapshot is built off the request path and published with a single
+  attribute assignment
+- JSON catalogs are applied as a diff keyed by (type, title): unchanged
+  jobs keep their ids, edited / added jobs take over freed or new ids, and
+  the search index and facets re-process only those ids (copy-on-write);
+  the affinity matrix is recomputed (vectorized, profiles are global)
+  (check_reload.py compares the result with a full rebuild over random edits)
+- packed catalogs are build artifacts and are swapped as a whole; they
+  are memory-mapped, so replace the file (write_packed writes a temp file
+  and renames it), never rewrite it in place: a snapshot still reading the
+  old mapping would die with SIGBUS
+- a file that fails to load (e.g. caught mid-save) leaves the current
+  snapshot in place; the next change is retried
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from catalog import BuiltinCatalog, catalog_version, job_card, load_catalog
+from facets import FacetIndex
+from recommend import Recommender
+from search import SearchIndex
+
+POLL_SECONDS = 2.0
+
+log = logging.getLogger("mbti.reload")
+
+Snapshot = namedtuple("Snapshot", "catalog index recommender facets")
+
+
+def build_snapshot(catalog):
+    return Snapshot(catalog, SearchIndex(catalog), Recommender(catalog), FacetIndex(catalog))
+
+
+def card_key(card, seen):
+    # (type, title, n): n tells apart repeated titles within a type
+    key = (card["mbti"], card["title"])
+    seen[key] = seen.get(key, -1) + 1
+    return key + (seen[key],)
+
+
+def diff_cards(old_catalog, jobs_by_type):
+    """Lay the new jobs out over the old ids.
+
+    Returns (cards, changed, counts): cards[i] is the job now at id i,
+    changed the ids whose job differs from old_catalog[i].
+    """
+    seen = {}
+    old_ids = {card_key(card, seen): i for i, card in enumerate(old_catalog)}
+    seen = {}
+    new_cards = {}
+    for mbti, jobs in jobs_by_type.items():
+        for job in jobs:
+            card = job_card(job, mbti)
+            new_cards[card_key(card, seen)] = card
+
+    cards = list(old_catalog)
+    changed = set()
+    holes = [i for key, i in old_ids.items() if key not in new_cards]
+    counts = {"added": 0, "edited": 0, "removed": len(holes)}
+    free = sorted(holes, reverse=True)
+    for key, card in new_cards.items():
+        i = old_ids.get(key)
+        if i is not None:
+            if cards[i] != card:
+                cards[i] = card
+                changed.add(i)
+                counts["edited"] += 1
+            continue
+        counts["added"] += 1
+        if free:
+            i = free.pop()
+            cards[i] = card
+        else:
+            i = len(cards)
+            cards.append(card)
+        changed.add(i)
+    # left-over holes: drop them from the end, fill the rest with the last jobs
+    free = set(free)
+    while free:
+        last = len(cards) - 1
+        if last in free:
+            free.discard(last)
+        else:
+            hole = min(free)
+            free.discard(hole)
+            cards[hole] = cards[last]
+            changed.add(hole)
+        cards.pop()
+        changed.discard(last)
+    return cards, changed, counts
+
+
+def apply_diff(snapshot, jobs_by_type):
+    old = snapshot.catalog
+    cards, changed, counts = diff_cards(old, jobs_by_type)
+    catalog = BuiltinCatalog.from_cards(cards, jobs_by_type.keys(), catalog_version(jobs_by_type))
+    return Snapshot(catalog,
+                    snapshot.index.updated(catalog, changed),
+                    Recommender(catalog),
+                    snapshot.facets.updated(catalog, old, changed)), counts
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class CatalogStore:
+    def __init__(self, path=None, poll_seconds=POLL_SECONDS):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.reloads = 0
+        self.last_reload = None  # {"version", "ms", "added", "edited", "removed"}
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stamp = file_stamp(path) if path else None
+        self._snapshot = build_snapshot(load_catalog(path))
+        if path:
+            threading.Thread(target=self._watch, name="catalog-watch", daemon=True).start()
+
+    def current(self):
+        return self._snapshot
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.check()
+            except Exception:
+                # an unexpected failure must not end the watcher: reload would stop for good
+                log.exception("catalog check failed, keeping %s", self._snapshot.catalog.version)
+
+    def check(self):
+        """Reload if the file changed since the last (attempted) load; True if a new snapshot was published."""
+        stamp = file_stamp(self.path)
+        if stamp is None or stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            t = time.perf_counter()
+            try:
+                if self.path.endswith(".json"):
+                    with open(self.path, encoding="utf-8") as f:
+                        jobs_by_type = json.load(f)
+                    snapshot, counts = apply_diff(self._snapshot, jobs_by_type)
+                else:
+                    snapshot, counts = build_snapshot(load_catalog(self.path)), {}
+            except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                log.warning("catalog reload failed, keeping %s: %s", self._snapshot.catalog.version, self.last_error)
+                return False
+            if snapshot.catalog.version == self._snapshot.catalog.version:
+                return False
+            self._snapshot = snapshot  # the swap: readers see the old or the new snapshot, never a mix
+            self.reloads += 1
+            self.last_error = None
+            self.last_reload = {"version": snapshot.catalog.version,
+                                "ms": round((time.perf_counter() - t) * 1000, 1), **counts}
+            log.info("catalog reloaded: %s", json.dumps(self.last_reload, ensure_ascii=False))
+            return True
+
+    def stats(self):
+        return {"path": self.path, "version": self._snapshot.catalog.version, "jobs": len(self._snapshot.catalog),
+                "reloads": self.reloads, "last_reload": self.last_reload, "last_error": self.last_error}
@@ -0,0 +1,227 @@
+"""
+Job search index (Korean-aware)
+
+- Built once per process from the job cards, then queried on every rerun
+- Syllable bigram postings narrow the candidates; matching is done on jamo
+  so a half-typed last syllable ("데잍" -> "데이터") still hits
+- The last syllable may still be mid-composition, so it is looked up by
+  its initial consonant only: a "next" posting maps each syllable + the
+  initial consonant of the one after it ("소" + "ㅌ") to the docs, which
+  every completion of the typed syllable keeps
+- Trailing 조사 are dropped when the full token has no match ("디자이너가")
+- Results are ranked by which fields matched (title > skills/majors > desc)
+- updated() derives the index for an edited card list by re-tokenizing only
+  the changed ids; posting sets are copied on write, so the old index stays
+  valid for reruns still using it
+"""
+
+import unicodedata
+
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+             "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+             "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# compound jamo typed on their own (e.g. a lone "ㄺ") decompose the same way
+COMPOUND_JAMO = {"ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+                 "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ",
+                 "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"}
+
+# longest first so "으로" wins over "로"
+PARTICLES = ("에서", "으로", "에게", "까지", "부터", "처럼", "보다", "이나",
+             "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만")
+
+# (field, weight) in the order fields are stored per document
+FIELDS = (("title", 3), ("skills", 2), ("majors", 2), ("desc", 1))
+
+
+def normalize(text):
+    return unicodedata.normalize("NFC", text or "").strip().lower()
+
+
+def to_jamo(text):
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            code -= HANGUL_FIRST
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[(code % 588) // 28])
+            out.append(JONGSEONG[code % 28])
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def lead_key(ch):
+    # unigram posting key: the initial consonant for syllables, the char itself otherwise
+    code = ord(ch)
+    if HANGUL_FIRST <= code <= HANGUL_LAST:
+        return CHOSEONG[(code - HANGUL_FIRST) // 588]
+    return COMPOUND_JAMO.get(ch, ch)[0]
+
+
+def strip_particle(token):
+    for p in PARTICLES:
+        if token.endswith(p) and len(token) - len(p) >= 2:
+            return token[:-len(p)]
+    return token
+
+
+def field_text(card, field):
+    value = card.get(field, "")
+    if isinstance(value, (list, tuple)):
+        value = " ".join(value)
+    return normalize(value)
+
+
+class SearchIndex:
+    """Inverted index over a list of job cards; ids are positions in `cards`."""
+
+    def __init__(self, cards):
+        self.cards = cards
+        self._jamo = []      # per doc: tuple of jamo strings, one per FIELDS entry
+        self._bigrams = {}   # "데이" -> {doc ids}
+        self._nexts = {}     # "데ㅇ" -> {doc ids}: a syllable + the initial consonant of the next
+        self._leads = {}     # "ㄷ" -> {doc ids}
+        for doc_id, card in enumerate(cards):
+            self._add(doc_id, card)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _add(self, doc_id, card):
+        texts = [field_text(card, f) for f, _ in FIELDS]
+        self._jamo.append(tuple(to_jamo(t) for t in texts))
+        for table, key in self._postings(texts):
+            table.setdefault(key, set()).add(doc_id)
+
+    def _postings(self, texts):
+        for text in texts:
+            for word in text.split():
+                for ch in word:
+                    yield self._leads, lead_key(ch)
+                for i in range(len(word) - 1):
+                    yield self._bigrams, word[i:i + 2]
+                    yield self._nexts, word[i] + lead_key(word[i + 1])
+
+    def updated(self, cards, changed):
+        """Index for `cards` where only ids in `changed` (and ids past the old end) differ from self.cards."""
+        new = SearchIndex.__new__(SearchIndex)
+        new.cards = cards
+        new._jamo = self._jamo[:len(cards)] + [None] * (len(cards) - len(self._jamo))
+        new._bigrams = dict(self._bigrams)
+        new._nexts = dict(self._nexts)
+        new._leads = dict(self._leads)
+        copied = set()  # (table, key) whose set is already private to `new`
+
+        def private(table, key):
+            if (id(table), key) not in copied:
+                copied.add((id(table), key))
+                table[key] = set(table.get(key, ()))
+            return table[key]
+
+        stale = [i for i in changed if i < len(self.cards)] + list(range(len(cards), len(self.cards)))
+        for doc_id in stale:
+            texts = [field_text(self.cards[doc_id], f) for f, _ in FIELDS]
+            for table, key in new._postings(texts):
+                private(table, key).discard(doc_id)
+        for doc_id in changed:
+            texts = [field_text(cards[doc_id], f) for f, _ in FIELDS]
+            new._jamo[doc_id] = tuple(to_jamo(t) for t in texts)
+            for table, key in new._postings(texts):
+                private(table, key).add(doc_id)
+        for table in (new._bigrams, new._nexts, new._leads):
+            for key in [k for k in table if (id(table), k) in copied and not table[k]]:
+                del table[key]
+        return new
+
+    def _candidates(self, token):
+        # the last char may still be mid-composition: the stable prefix is looked
+        # up by exact bigrams, the last char by its initial consonant only; the
+        # jamo check in _score does the rest
+        if len(token) < 2:
+            return self._leads.get(lead_key(token), set())
+        if "\u3131" <= token[-1] <= "\u318e":
+            # a lone jamo may still join the syllable before it ("데ㄹ" -> "델")
+            return self._candidates(token[:-1])
+        postings = [self._bigrams.get(token[i:i + 2]) for i in range(len(token) - 2)]
+        postings.append(self._nexts.get(token[-2] + lead_key(token[-1])))
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids &= posting
+        return ids
+
+    def _score(self, doc_id, token_jamo):
+        score = 0
+        for (field, weight), text in zip(FIELDS, self._jamo[doc_id]):
+            if token_jamo in text:
+                score += weight
+                if field == "title" and text.startswith(token_jamo):
+                    score += 1
+        return score
+
+    def _match_token(self, token):
+        token_jamo = to_jamo(token)
+        hits = {}
+        for doc_id in self._candidates(token):
+            s = self._score(doc_id, token_jamo)
+            if s:
+                hits[doc_id] = s
+        return hits
+
+    def search(self, query):
+        """Return [(doc_id, score), ...] best first; every token must match."""
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+        total = None
+        for token in tokens:
+            hits = self._match_token(token)
+            if not hits:
+                stripped = strip_particle(token)
+                if stripped != token:
+                    hits = self._match_token(stripped)
+            if not hits:
+                return []
+            if total is None:
+                total = hits
+            else:
+                total = {d: total[d] + s for d, s in hits.items() if d in total}
+                if not total:
+                    return []
+        return sorted(total.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def select_cards(catalog, index, selected_mbti, only_selected, query, recommender=None, k=None, allowed=None):
+    """Filter + sort for the card grid; returns a tuple of catalog ids.
+
+    With a recommender: best MBTI affinity first (boosted by the search
+    score), optionally only the top k. Without one: selected MBTI first,
+    then search score, then title. allowed (e.g. a facets.Selection) limits
+    the candidates to the ids it contains.
+    """
+    if query:
+        scores = dict(index.search(query))
+        ids = list(scores)
+        if only_selected:
+            type_ids = set(catalog.ids_for_type(selected_mbti))
+            ids = [i for i in ids if i in type_ids]
+        if allowed is not None:
+            ids = [i for i in ids if i in allowed]
+    else:
+        scores = {}
+        ids = list(catalog.ids_for_type(selected_mbti)) if only_selected else None
+        if allowed is not None:
+            ids = [int(i) for i in allowed.ids] if ids is None else [i for i in ids if i in allowed]
+    if recommender is not None:
+        return tuple(int(i) for i in recommender.rank(selected_mbti, ids, scores, k=k))
+    if ids is None:
+        ids = list(range(len(catalog)))
+    cards = {i: catalog[i] for i in ids}
+    ids.sort(key=lambda i: (0 if cards[i]["mbti"] == selected_mbti else 1, -scores.get(i, 0), cards[i]["title"]))
+    return tuple(ids[:k] if k is not None else ids)
@@ -0,0 +1,258 @@
+"""
+Per-session memory accounting, caps and idle release
+
+- each session has a SessionMemory (kept in its session_state) that the
+  app reports its large objects to: uploads (raw bytes of the uploads
+  kept in session state plus processed thumbnails in the session's UploadStore),
+  favorites (entries plus the DataFrame behind the table) and exports
+  (prepared export bytes, per-card CSV bytes of the current run)
+- one process-wide SessionRegistry (st.cache_resource) holds weak
+  references to them: a closed session is freed as before and simply
+  drops out of the totals
+- releasable objects are the ones the app can rebuild on demand: prepared
+  exports, processed upload thumbnails and the favorites DataFrame.
+  Favorites themselves and the uploads' raw bytes are only counted
+- caps: a new upload or export is admitted under both caps, one
+  admission at a time. Past session_cap it first releases that session's
+  releasable objects (except thumbnails of uploads still in use); past
+  global_cap it releases other sessions, least recently active first, then
+  this one. It is refused if it still does not fit. An upload is checked
+  once, when it first appears, and remembered as accepted or refused for
+  as long as the session keeps it. The sweep applies global_cap too
+- released vs freed: releasing drops the session's references, so the
+  bytes leave the account. Only thumbnails and favorites tables are freed
+  by that; an export's bytes stay with Streamlit's media file manager
+  until it drops the session's files, and raw upload bytes are never
+  released. stats() reports both figures
+- idle release: sessions not seen for idle_seconds are released by the
+  next sweep, which runs on any session's rerun at most every SWEEP_SECONDS
+"""
+
+import os
+import threading
+import time
+import weakref
+
+from images import upload_id
+
+SWEEP_SECONDS = 10.0
+KINDS = ("uploads", "favorites", "exports")
+
+
+class SessionMemory:
+    def __init__(self, sid):
+        self.sid = sid
+        self.started = self.last_seen = time.time()
+        self.upload_store = None
+        self.favorites = None
+        self.uploads = {}       # accepted upload id -> raw bytes (held in session state)
+        self.refused_uploads = set()
+        self._seen_uploads = set()
+        self.exports = {}       # key -> (signature, bytes), until served, replaced or released
+        self.card_csv = {}      # card id -> CSV bytes handed to st.download_button this run
+        self.releases = 0
+        self._lock = threading.RLock()
+
+    def begin(self):
+        """Start of a full rerun: per-run figures are counted again."""
+        with self._lock:
+            self._seen_uploads = set()
+            self.card_csv.clear()
+
+    def end_uploads(self):
+        """After the uploads were checked: forget uploads that are no longer kept."""
+        with self._lock:
+            self.uploads = {uid: n for uid, n in self.uploads.items() if uid in self._seen_uploads}
+            self.refused_uploads &= self._seen_uploads
+
+    def sizes(self):
+        with self._lock:
+            uploads = sum(self.uploads.values()) + (self.upload_store.thumbs.nbytes if self.upload_store else 0)
+            favorites = self.favorites.nbytes() if self.favorites is not None else 0
+            exports = sum(len(data) for _, data in self.exports.values()) + sum(self.card_csv.values())
+        return {"uploads": uploads, "favorites": favorites, "exports": exports}
+
+    def total(self):
+        return sum(self.sizes().values())
+
+    def _thumb_bytes(self, keep_in_use):
+        if self.upload_store is None:
+            return 0
+        return self.upload_store.unused_bytes(self.uploads) if keep_in_use else self.upload_store.thumbs.nbytes
+
+    def _freeable(self, keep_in_use):
+        return self._thumb_bytes(keep_in_use) + (self.favorites.table_nbytes() if self.favorites is not None else 0)
+
+    def releasable(self, keep_in_use=False):
+        """Bytes release() would take out of the account."""
+        with self._lock:
+            return sum(len(data) for _, data in self.exports.values()) + self._freeable(keep_in_use)
+
+    # -----------------------
+    # Exports: the bytes handed to st.download_button (which keeps a reference
+    # to this same object), dropped once downloaded, replaced or released
+    # -----------------------
+    def put_export(self, key, signature, data):
+        with self._lock:
+            self.exports[key] = (signature, data)
+
+    def export_data(self, key, signature):
+        """Bytes of a prepared export with this signature, else None."""
+        with self._lock:
+            ready = self.exports.get(key)
+            return ready[1] if ready and ready[0] == signature else None
+
+    def drop_export(self, key):
+        with self._lock:
+            self.exports.pop(key, None)
+
+    def release(self, keep_in_use=False):
+        """Drop everything that can be rebuilt on demand; returns (released, freed) bytes.
+
+        released leaves the account; freed is the part this drops for good
+        (thumbnails, favorites table). keep_in_use keeps the thumbnails of
+        accepted uploads (an active session making room); an idle session
+        drops them too.
+        """
+        with self._lock:
+            released, freed = self.releasable(keep_in_use), self._freeable(keep_in_use)
+            self.exports.clear()
+            if self.upload_store is not None:
+                self.upload_store.release(self.uploads if keep_in_use else ())
+            if self.favorites is not None:
+                self.favorites.release_table()
+            if released:
+                self.releases += 1
+        return released, freed
+
+
+class SessionRegistry:
+    def __init__(self, session_cap, global_cap, idle_seconds, sweep_seconds=SWEEP_SECONDS):
+        self.session_cap = session_cap
+        self.global_cap = global_cap
+        self.idle_seconds = idle_seconds
+        self.sweep_seconds = sweep_seconds
+        self.released_bytes = 0
+        self.freed_bytes = 0
+        self.releases = {"idle": 0, "session_cap": 0, "global_cap": 0}
+        self.refused = 0
+        self._sessions = {}  # sid -> weakref to SessionMemory
+        self._lock = threading.Lock()
+        self._admit_lock = threading.Lock()  # one admission at a time, so two cannot share the same headroom
+        self._last_sweep = 0.0
+
+    def session(self, sid):
+        """The session's SessionMemory, created and registered on first use."""
+        with self._lock:
+            ref = self._sessions.get(sid)
+            mem = ref() if ref else None
+            if mem is None:
+                mem = SessionMemory(sid)
+                self._sessions[sid] = weakref.ref(mem)
+        return mem
+
+    def live(self):
+        with self._lock:
+            for sid in [sid for sid, ref in self._sessions.items() if ref() is None]:
+                del self._sessions[sid]
+            return [mem for mem in (ref() for ref in self._sessions.values()) if mem is not None]
+
+    def touch(self, mem):
+        mem.last_seen = time.time()
+        if mem.last_seen - self._last_sweep >= self.sweep_seconds:
+            self.sweep(exclude=mem)
+
+    def _release(self, mem, reason, keep_in_use=False):
+        released, freed = mem.release(keep_in_use)
+        if released:
+            self.released_bytes += released
+            self.freed_bytes += freed
+            self.releases[reason] += 1
+        return released
+
+    def _fits_session(self, mem, nbytes):
+        if mem.total() + nbytes <= self.session_cap:
+            return True
+        if mem.releasable(keep_in_use=True):
+            self._release(mem, "session_cap", keep_in_use=True)
+        return mem.total() + nbytes <= self.session_cap
+
+    def _fits_global(self, mem, nbytes):
+        sessions = self.live()
+        total = sum(m.total() for m in sessions) + nbytes
+        # least recently active first; the caller keeps its uploads' thumbnails and goes last
+        for other in sorted(sessions, key=lambda m: (m is mem, m.last_seen)):
+            if total <= self.global_cap:
+                break
+            total -= self._release(other, "global_cap", keep_in_use=other is mem)
+        return total <= self.global_cap
+
+    def allow(self, mem, nbytes):
+        """Whether nbytes more fit under the session and global caps, releasing caches if that helps."""
+        if self._fits_session(mem, nbytes) and self._fits_global(mem, nbytes):
+            return True
+        self.refused += 1
+        return False
+
+    def admit_upload(self, mem, upload):
+        """Whether an upload may be used; only checked against the caps the first time it is seen."""
+        uid = upload_id(upload)
+        with self._admit_lock, mem._lock:
+            mem._seen_uploads.add(uid)
+            if uid in mem.uploads:
+                return True
+            if uid in mem.refused_uploads:
+                return False
+            ok = self.allow(mem, upload.size)
+            if ok:
+                mem.uploads[uid] = upload.size
+            else:
+                mem.refused_uploads.add(uid)
+            return ok
+
+    def admit_export(self, mem, key, signature, data):
+        """Keep a built export's bytes if they fit the caps; whether they were kept."""
+        with self._admit_lock:
+            if not self.allow(mem, len(data)):
+                return False
+            mem.put_export(key, signature, data)
+            return True
+
+    def sweep(self, exclude=None):
+        now = self._last_sweep = time.time()
+        sessions = self.live()
+        for mem in sessions:
+            if mem is not exclude and now - mem.last_seen > self.idle_seconds and mem.releasable():
+                self._release(mem, "idle")
+        total = sum(mem.total() for mem in sessions)
+        # least recently active first; the caller is released last, if at all
+        for mem in sorted(sessions, key=lambda m: (m is exclude, m.last_seen)):
+            if total <= self.global_cap:
+                break
+            total -= self._release(mem, "global_cap")
+
+    def stats(self, top=10):
+        now = time.time()
+        rows = []
+        for mem in self.live():
+            sizes = mem.sizes()
+            rows.append({"sid": mem.sid, "idle_s": round(now - mem.last_seen), **sizes,
+                         "total": sum(sizes.values()), "releases": mem.releases})
+        rows.sort(key=lambda r: -r["total"])
+        return {
+            "sessions": len(rows),
+            "active": sum(1 for r in rows if r["idle_s"] <= self.idle_seconds),
+            "bytes": {kind: sum(r[kind] for r in rows) for kind in KINDS},
+            "total": sum(r["total"] for r in rows),
+            "session_cap": self.session_cap, "global_cap": self.global_cap, "idle_seconds": self.idle_seconds,
+            "released_bytes": self.released_bytes, "freed_bytes": self.freed_bytes,
+            "releases": dict(self.releases), "refused": self.refused,
+            "top": rows[:top],
+        }
+
+
+def open_registry():
+    # caps in MB, idle time in minutes
+    return SessionRegistry(session_cap=int(float(os.environ.get("MBTI_SESSION_MB", "32")) * (1 << 20)),
+                           global_cap=int(float(os.environ.get("MBTI_SESSIONS_MB", "1024")) * (1 << 20)),
+                           idle_seconds=float(os.environ.get("MBTI_SESSION_IDLE_MIN", "15")) * 60)
@@ -1,5 +1,9 @@
-import streamlit as st
 import time
+import uuid
+import streamlit as st
+from analytics import open_analytics
+from colors import ColorTest, default_colors_path, load_colors
+from theme import stylesheet_html
 
 # =====================
 # Page Setup
@@ -9,63 +13,34 @@ st.set_page_config(
     page_icon="🖌️",
     layout="wide"
 )
+t0 = time.perf_counter()
+
+# 사용 통계: 메모리 버퍼에 쌓고 백그라운드 스레드가 SQLite에 기록 (analytics.py)
+@st.cache_resource
+def get_analytics():
+    return open_analytics()
+
+analytics = get_analytics()
+sid = st.session_state.setdefault("sid", uuid.uuid4().hex[:12])
 
 st.title("🎨 나의 색채 심리 테스트")
 st.markdown("좋아하는 색을 선택하면 심리적 특성, 성격 유형, 디자인 취향, 학습 스타일, 직업 적합성까지 알려줍니다.")
 
 # =====================
-# 색상 데이터
+# 색상 데이터 / 엔진 (colors.py): 프로세스당 한 번 로드, 결과 카드는 색마다 한 번만 렌더링
 # =====================
-color_data = {
-    "빨강": {"hex":"#E53935", "desc":"강렬한 열정과 에너지를 가지고 있으며, 모험과 도전을 즐깁니다. 대담하고 리더십이 강합니다.",
-             "design":"강렬한 대비와 포인트 색상, 역동적 디자인 선호",
-             "learning":"행동 중심, 실습과 활동형 학습 선호",
-             "career":"리더, 마케팅, 운동선수, 창의적 프로젝트 적합"},
-    "주황": {"hex":"#FB8C00", "desc":"밝고 사교적이며 창의력이 풍부합니다. 팀워크를 즐기고 주변 사람들과 소통을 좋아합니다.",
-             "design":"활기찬 색상과 재미있는 패턴 디자인 선호",
-             "learning":"그룹 학습과 아이디어 공유형 학습 선호",
-             "career":"광고, 이벤트, 기획, 교육 관련 직업 적합"},
-    "노랑": {"hex":"#FDD835", "desc":"낙천적이고 호기심이 많으며 창의적인 사고를 즐깁니다. 명랑하고 긍정적입니다.",
-             "design":"밝고 경쾌한 색상, 눈에 띄는 디자인 선호",
-             "learning":"관찰과 실험 중심 학습 선호",
-             "career":"디자이너, 예술가, 강사, 창의적 직업 적합"},
-    "초록": {"hex":"#43A047", "desc":"조화롭고 안정적인 성격으로 감정이 안정적입니다. 자연과 균형을 중요시합니다.",
-             "design":"자연색, 부드러운 톤과 편안한 디자인 선호",
-             "learning":"계획적, 집중 학습 선호",
-             "career":"환경, 치유, 자연 관련 직업 적합"},
-    "파랑": {"hex":"#1E88E5", "desc":"차분하고 신중하며 분석적입니다. 안정과 신뢰를 중요시합니다.",
-             "design":"정돈된 레이아웃과 미니멀 디자인 선호",
-             "learning":"분석적, 자료 정리 중심 학습 선호",
-             "career":"연구, 공학, IT, 관리 직무 적합"},
-    "보라": {"hex":"#8E24AA", "desc":"예술적 감각이 뛰어나고 창의적입니다. 독창적이고 감성적인 사고를 선호합니다.",
-             "design":"독창적이고 예술적인 패턴과 디자인 선호",
-             "learning":"창의적 프로젝트 중심 학습 선호",
-             "career":"예술, 디자인, 창작 직업 적합"},
-    "분홍": {"hex":"#EC407A", "desc":"사교적이고 다정하며 감성적입니다. 타인과 소통과 배려를 중요시합니다.",
-             "design":"부드럽고 로맨틱한 색상과 디자인 선호",
-             "learning":"협동 학습 및 소통 중심 학습 선호",
-             "career":"교육, 상담, 서비스 관련 직업 적합"},
-    "청록": {"hex":"#00ACC1", "desc":"논리적이면서도 차분하고 독창적인 성향이 있습니다.",
-             "design":"현대적이고 깔끔한 톤의 디자인 선호",
-             "learning":"분석과 관찰 중심 학습 선호",
-             "career":"연구, IT, 디자인 직업 적합"},
-    "갈색": {"hex":"#6D4C41", "desc":"현실적이고 신뢰할 수 있는 성격입니다. 안정감과 성실함을 중요시합니다.",
-             "design":"내추럴 톤, 편안하고 안정적인 디자인 선호",
-             "learning":"체계적, 반복 학습 스타일",
-             "career":"관리, 회계, 교육, 자연 관련 직업 적합"},
-    "검정": {"hex":"#212121", "desc":"신비롭고 세련된 이미지를 선호하며 집중력과 자기주장이 강합니다.",
-             "design":"모던, 심플, 고급스러운 디자인 선호",
-             "learning":"집중적 자기주도 학습 선호",
-             "career":"디자인, 예술, 기획, 전략적 직무 적합"},
-    "흰색": {"hex":"#FAFAFA", "desc":"순수하고 깔끔하며 평화를 중시합니다. 객관적이고 새로운 시작을 좋아합니다.",
-             "design":"깔끔하고 정돈된 디자인 선호",
-             "learning":"정리와 계획 중심 학습 선호",
-             "career":"교육, 연구, 기획, 상담 직업 적합"},
-    "회색": {"hex":"#9E9E9E", "desc":"중립적이고 분석적이며 침착합니다. 감정을 안정적으로 유지합니다.",
-             "design":"차분하고 절제된 디자인 선호",
-             "learning":"논리적, 분석적 학습 선호",
-             "career":"IT, 분석, 회계, 관리 직무 적합"}
-}
+@st.cache_resource
+def get_color_test(path):
+    return ColorTest(load_colors(path))
+
+color_test = get_color_test(default_colors_path())
+
+# 버튼/배경/결과 카드 스타일은 한 번만 컴파일·압축해 캐시 (rerun마다 캐시된 <style> 하나만 전송)
+@st.cache_resource
+def get_stylesheet(path):
+    return stylesheet_html(get_color_test(path).css())
+
+st.markdown(get_stylesheet(default_colors_path()), unsafe_allow_html=True)
 
 # =====================
 # 선택 UI
@@ -74,84 +49,21 @@ st.markdown("### 좋아하는 색을 선택하세요:")
 selected_color = st.session_state.get("selected_color", None)
 cols = st.columns(4)
 
-for i, (color_name, info) in enumerate(color_data.items()):
+for i, color_name in enumerate(color_test.names):
     with cols[i % 4]:
-        if st.button(color_name):
+        if st.button(color_name, key=f"color_{i}"):
             st.session_state["selected_color"] = color_name
             selected_color = color_name
-            # 클릭 강조 애니메이션 (간단한 플래시 효과)
-            st.markdown(f"""
-            <script>
-            const btns = window.parent.document.querySelectorAll("button:contains('{color_name}')");
-            btns.forEach(btn => {{
-                btn.style.transform = "scale(1.2)";
-                setTimeout(()=>{{ btn.style.transform = "scale(1)"; }}, 200);
-            }});
-            </script>
-            """, unsafe_allow_html=True)
-
-        # 버튼 스타일
-        st.markdown(f"""
-        <style>
-        div.stButton > button:contains("{color_name}") {{
-            background-color: {info['hex']};
-            color: {"#000000" if color_name in ['노랑','청록','주황'] else "#FFFFFF"};
-            border-radius: 12px;
-            height: 60px;
-            font-size: 16px;
-            font-weight: bold;
-            margin-bottom: 10px;
-            transition: transform 0.2s;
-        }}
-        div.stButton > button:contains("{color_name}"):hover {{
-            transform: scale(1.1);
-        }}
-        </style>
-        """, unsafe_allow_html=True)
+            analytics.record("color", "test", sid, item=color_name)
 
 # =====================
 # 결과 카드
 # =====================
-if selected_color:
-    info = color_data[selected_color]
-
-    # 페이지 배경색
-    st.markdown(f"""
-    <style>
-    .stApp {{
-        background-color: {info['hex']};
-        color: {"#000000" if selected_color in ['노랑','청록','주황'] else "#FFFFFF"};
-        transition: background-color 0.5s ease;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+if selected_color in color_test.index:
+    # 페이지 배경색 (스타일시트의 해당 색 규칙을 마커 클래스로 선택)
+    st.markdown(f'<div class="color-bg-{color_test.index[selected_color]}"></div>', unsafe_allow_html=True)
 
-    # 카드형 결과 + fade-in 애니메이션
-    st.markdown(f"""
-    <div style="
-        background-color: rgba(255,255,255,0.15);
-        padding: 25px;
-        border-radius: 25px;
-        box-shadow: 8px 8px 30px rgba(0,0,0,0.4);
-        margin-top: 20px;
-        border: 2px solid rgba(255,255,255,0.3);
-        animation: fadeIn 1s ease-in;
-    ">
-        <h2 style='text-align:center;'>🎯 선택 색상: {selected_color}</h2>
-        <h3>💡 심리/성격</h3>
-        <p>{info['desc']}</p>
-        <h3>🎨 디자인 취향</h3>
-        <p>{info['design']}</p>
-        <h3>📚 학습 스타일</h3>
-        <p>{info['learning']}</p>
-        <h3>💼 직업 적합성</h3>
-        <p>{info['career']}</p>
-    </div>
+    # 카드형 결과 + fade-in 애니메이션 (색마다 한 번 렌더링된 HTML)
+    st.markdown(color_test.result_html(selected_color), unsafe_allow_html=True)
 
-    <style>
-    @keyframes fadeIn {{
-        from {{opacity: 0; transform: translateY(20px);}}
-        to {{opacity: 1; transform: translateY(0);}}
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+analytics.record("rerun", "test", sid, value=(time.perf_counter() - t0) * 1000)
@@ -0,0 +1,188 @@
+"""
+Theme / fonts / CSS, compiled once per process
+
+- the apps send their minified sheet as one inline <style>: Streamlit's
+  static file serving only serves images / PDFs with their real type (a
+  .css file goes out as text/plain + nosniff and browsers drop it), so it
+  is kept for card thumbnails only. Streamlit resends every element on
+  each rerun, so the inline sheet is part of every rerun's payload
+- main.py's sheet (app_css) holds the static rules only; the selected
+  theme color comes with each rerun as one --theme rule (theme_style)
+  instead of a rule per MBTI variant
+- the prerendered site (prerender.py) gets everything in one content-hashed
+  .css file (publish), with the variants selected by
+  .stApp:has(.theme-XXXX) marker classes
+"""
+
+import hashlib
+import os
+
+MBTI_COLORS = {
+    "ISTJ": "#2B6CB0", "ISFJ": "#319795", "INFJ": "#805AD5", "INTJ": "#D69E2E",
+    "ISTP": "#1A202C", "ISFP": "#ED8936", "INFP": "#D53F8C", "INTP": "#2B6CB0",
+    "ESTP": "#DD6B20", "ESFP": "#ED64A6", "ENFP": "#38A169", "ENTP": "#4C51BF",
+    "ESTJ": "#2C7A7B", "ESFJ": "#DD6B20", "ENFJ": "#9F7AEA", "ENTJ": "#E53E3E"
+}
+
+FONTS_IMPORT = "@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;500;700;800&display=swap');"
+
+BASE_CSS = """
+:root{ --radius:14px; }
+html, body, [class*="css"] { font-family: 'Poppins', sans-serif; background: linear-gradient(180deg, #f6f9fc, #ffffff); }
+
+/* Header */
+.app-header {
+  padding: 28px;
+  border-radius: 16px;
+  margin-bottom: 20px;
+  display:flex;
+  align-items:center;
+  justify-content:space-between;
+  gap: 20px;
+}
+.brand {
+  display:flex; align-items:center; gap:16px;
+}
+.brand .logo {
+  width:68px; height:68px; border-radius:12px; display:flex; align-items:center; justify-content:center;
+  background: linear-gradient(135deg, rgba(255,255,255,0.1), rgba(0,0,0,0.03));
+  box-shadow: 0 6px 18px rgba(16,24,40,0.06);
+  font-weight:800; font-size:24px;
+}
+.title {
+  font-size:22px; font-weight:800; color:#111827;
+}
+.subtitle { color:#6B7280; font-size:13px; }
+
+/* Controls */
+.controls { display:flex; gap:12px; align-items:center; }
+
+/* Cards grid */
+.grid { display:grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap:20px; }
+.job-card {
+  background: #fff; border-radius: var(--radius); padding:0; overflow:hidden;
+  box-shadow: 0 8px 30px rgba(13, 38, 59, 0.06);
+  transition: transform .18s ease, box-shadow .18s ease;
+}
+.job-card:hover { transform: translateY(-6px); box-shadow: 0 14px 40px rgba(13, 38, 59, 0.10); }
+.job-media { width:100%; height:180px; object-fit:cover; display:block; }
+.job-body { padding:18px; }
+.job-head { display:flex; justify-content:space-between; align-items:flex-start; gap:12px; }
+.job-title { font-weight:700; font-size:18px; }
+.job-icon { font-size:24px; }
+.job-desc { margin-top:8px; color:#374151; font-size:14px; line-height:1.35; }
+.job-share { display:inline-block; margin-top:10px; font-size:13px; text-decoration:none; }
+.badge { font-size:12px; padding:6px 10px; border-radius:999px; font-weight:600; }
+
+/* footer */
+.footer { margin-top:28px; color:#9CA3AF; font-size:13px; text-align:center; padding:18px; }
+
+@media(max-width:640px){
+  .job-media { height:140px; }
+  .controls { flex-direction:column; align-items:stretch; gap:10px; }
+}
+"""
+
+# header / badges follow --theme, which the selected variant sets
+THEMED_CSS = """
+.app-header { background: linear-gradient(90deg, color-mix(in srgb, var(--theme) 20%, transparent), #ffffff);
+  border:1px solid color-mix(in srgb, var(--theme) 13%, transparent); }
+.app-header .logo { background: linear-gradient(135deg, var(--theme), #ffffff33); color:#fff; }
+.badge-theme { background: color-mix(in srgb, var(--theme) 13%, transparent); color: var(--theme);
+  border:1px solid color-mix(in srgb, var(--theme) 20%, transparent); }
+.badge-plain { background:#fff; color:#374151; border:1px solid #E5E7EB; }
+.job-meta { font-size:12px; color:#6B7280; margin-top:6px; }
+.job-majors-label { font-size:12px; color:#9CA3AF; }
+.job-majors { font-weight:600; margin-top:6px; }
+.shared-card { background:#fff; border-radius: var(--radius); margin-bottom:12px;
+  border:2px solid color-mix(in srgb, var(--theme) 40%, transparent); box-shadow: 0 8px 30px rgba(13, 38, 59, 0.06); }
+"""
+
+# test.py: color buttons, page background and the result card
+COLOR_TEST_CSS = """
+div.stButton > button { border-radius: 12px; height: 60px; font-size: 16px; font-weight: bold;
+  margin-bottom: 10px; transition: transform 0.2s; }
+div.stButton > button:hover { transform: scale(1.1); }
+.stApp { transition: background-color 0.5s ease; }
+.color-result { background-color: rgba(255,255,255,0.15); padding: 25px; border-radius: 25px;
+  box-shadow: 8px 8px 30px rgba(0,0,0,0.4); margin-top: 20px; border: 2px solid rgba(255,255,255,0.3);
+  animation: fadeIn 1s ease-in; }
+.color-result h2 { text-align:center; }
+@keyframes fadeIn {
+  from {opacity: 0; transform: translateY(20px);}
+  to {opacity: 1; transform: translateY(0);}
+}
+"""
+
+# prerender.py: page frame of the static site (no Streamlit layout around it)
+SITE_CSS = """
+body { margin:0; }
+.stApp { min-height:100vh; --theme:#4C51BF; }
+.site { max-width:1180px; margin:0 auto; padding:24px 20px; }
+.site-nav { display:flex; flex-wrap:wrap; gap:8px; margin:0 0 18px; font-size:14px; }
+.site-nav a { text-decoration:none; color:inherit; }
+.site h2 { margin:28px 0 12px; font-size:20px; }
+.tiles { display:grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap:12px; }
+.tile { display:block; padding:16px 12px; border-radius:12px; text-align:center; font-weight:700;
+  text-decoration:none; background:#fff; box-shadow: 0 6px 18px rgba(16,24,40,0.06); }
+"""
+
+
+def mbti_rules(colors):
+    return "\n".join(
+        f".stApp:has(.theme-{t}) {{ --theme:{c}; }}\n.mbti-{t} {{ color:{c}; }}" for t, c in colors.items())
+
+
+def color_rules(color_data, text_color):
+    # one button style (keyed button "color_<i>") and one background per color
+    rules = []
+    for i, (name, info) in enumerate(color_data.items()):
+        fg = text_color(name, info)
+        rules.append(f".st-key-color_{i} button {{ background-color:{info['hex']}; color:{fg}; }}")
+        rules.append(f".stApp:has(.color-bg-{i}) {{ background-color:{info['hex']}; color:{fg}; }}")
+    return "\n".join(rules)
+
+
+def main_css(colors=MBTI_COLORS):
+    return "\n".join([FONTS_IMPORT, BASE_CSS, THEMED_CSS, mbti_rules(colors)])
+
+
+def app_css(colors=MBTI_COLORS):
+    # .mbti-XXXX text colors stay: badges of every type can be on the page
+    return "\n".join([FONTS_IMPORT, BASE_CSS, THEMED_CSS] + [f".mbti-{t} {{ color:{c}; }}" for t, c in colors.items()])
+
+
+def theme_style(color, mbti=None):
+    """Per-rerun rule for the selected theme color (and its type's text color, when overridden)."""
+    rule = f".stApp {{ --theme:{color}; }}"
+    if mbti:
+        rule += f" .mbti-{mbti} {{ color:{color}; }}"
+    return f"<style>{rule}</style>"
+
+
+def color_test_css(color_data, text_color):
+    return "\n".join([COLOR_TEST_CSS, color_rules(color_data, text_color)])
+
+
+def minify(css):
+    return " ".join(line.strip() for line in css.splitlines() if line.strip())
+
+
+def publish(name, css, css_dir, url):
+    """Write css under a content-hash name in css_dir; returns its path under url."""
+    css = minify(css)
+    digest = hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
+    filename = f"{name}.{digest}.css"
+    path = os.path.join(css_dir, filename)
+    if not os.path.exists(path):
+        os.makedirs(css_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp, path)
+    return f"{url}/{filename}"
+
+
+def stylesheet_html(css):
+    """The minified sheet as one inline <style> block (build once, cache per process)."""
+    return f"<style>{minify(css)}</style>"